@@ -0,0 +1,29 @@
+import json
+import os
+import sys
+
+DATA_DIR = os.path.join(getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__))), "data")
+CATALOG_PATH = os.path.join(DATA_DIR, "ItemID.txt")
+
+def read_item_entries(path: str = CATALOG_PATH) -> list[dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        txt = f.read()
+    try:
+        return json.loads(txt)
+    except json.JSONDecodeError:
+        txt = txt.strip()
+        if not txt.startswith('['):
+            txt = '[' + txt.rstrip(',\n') + ']'
+        return json.loads(txt)
+
+def index_by_name(entries: list[dict]) -> dict[str, dict]:
+    return {entry["SourceString"].strip(): entry for entry in entries if entry.get("SourceString", "").strip()}
+
+def index_by_persistence_id(entries: list[dict]) -> dict[str, dict]:
+    return {entry["PersistenceID"]: entry for entry in entries if entry.get("PersistenceID")}
+
+def diff_entries(old_by_pid: dict[str, dict], new_by_pid: dict[str, dict]) -> tuple[list[str], list[str], list[str]]:
+    added = [pid for pid in new_by_pid if pid not in old_by_pid]
+    removed = [pid for pid in old_by_pid if pid not in new_by_pid]
+    changed = [pid for pid in new_by_pid if pid in old_by_pid and new_by_pid[pid] != old_by_pid[pid]]
+    return added, removed, changed
@@ -0,0 +1,362 @@
+import argparse
+import json
+import os
+import secrets
+import shutil
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+import catalog
+import save_io
+from guid_registry import GuidRegistry
+from injection import build_merged_inventory, make_queue_entry
+from slot_model import SlotTable
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 47610
+DEFAULT_TOKEN_PATH = os.path.join(tempfile.gettempdir(), "rsd_editor_daemon.token")
+HTTP_METHODS = (b"GET ", b"HEAD ", b"POST ", b"PUT ", b"DELETE ", b"OPTIONS ", b"PATCH ", b"CONNECT ", b"TRACE ")
+SAVE_CACHE_SIZE = 16
+MAX_SLOT_INDEX = 79
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+UNAUTHORIZED = -32001
+
+class RpcError(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+class EditorState:
+    def __init__(self, catalog_path: str = catalog.CATALOG_PATH):
+        self.catalog_path = catalog_path
+        self.lock = threading.RLock()
+        self.saves = OrderedDict()
+        self.started = time.time()
+        self.load_catalog()
+
+    def load_catalog(self) -> int:
+        entries = catalog.read_item_entries(self.catalog_path)
+        with self.lock:
+            self.by_name = catalog.index_by_name(entries)
+            self.by_pid = catalog.index_by_persistence_id(entries)
+        return len(entries)
+
+    def session(self, path: str) -> save_io.SaveSession:
+        if not os.path.isfile(path):
+            raise RpcError(INVALID_PARAMS, f"Save file not found: {path}")
+        with self.lock:
+            session = self.saves.get(path)
+            if session is None:
+                session = self.saves[path] = save_io.SaveSession(path)
+                if len(self.saves) > SAVE_CACHE_SIZE:
+                    self.saves.popitem(last=False)
+            else:
+                self.saves.move_to_end(path)
+            return session
+
+    def inventory(self, path: str) -> SlotTable:
+        try:
+            return self.session(path).load()
+        except json.JSONDecodeError as exc:
+            raise RpcError(INVALID_PARAMS, f"Invalid JSON format in save file: {exc}")
+
+    def forget(self, path: str) -> None:
+        with self.lock:
+            self.saves.pop(path, None)
+
+    def item_name(self, item_id: str | None) -> str | None:
+        item = self.by_pid.get(item_id)
+        return item.get("SourceString") if item else None
+
+    def resolve_entry(self, raw: dict) -> dict:
+        item = self.by_pid.get(raw.get("persistence_id"))
+        if item is None:
+            item = self.by_name.get(str(raw.get("item_name", "")).strip())
+        if item is None:
+            raise RpcError(INVALID_PARAMS, f"Unknown item: {raw.get('item_name') or raw.get('persistence_id')!r}")
+        try:
+            start_slot = int(raw["start_slot"])
+            end_slot = int(raw.get("end_slot", start_slot))
+            count = int(raw.get("count", 1))
+            durability = int(raw["durability"]) if raw.get("durability") is not None else None
+        except (KeyError, TypeError, ValueError):
+            raise RpcError(INVALID_PARAMS, f"Queue entries need numeric start_slot, end_slot and count: {raw!r}")
+        if not 0 <= start_slot <= end_slot <= MAX_SLOT_INDEX:
+            raise RpcError(INVALID_PARAMS, f"Slot range {start_slot}-{end_slot} is outside 0-{MAX_SLOT_INDEX}")
+        return make_queue_entry(item["SourceString"].strip(), item, count, start_slot, end_slot, durability)
+
+    def resolve_queue(self, queue) -> list[dict]:
+        if not isinstance(queue, list) or not all(isinstance(raw, dict) for raw in queue):
+            raise RpcError(INVALID_PARAMS, "queue must be a list of objects")
+        return [self.resolve_entry(raw) for raw in queue]
+
+    def rpc_ping(self) -> dict:
+        return {"uptime": time.time() - self.started, "items": len(self.by_pid), "saves": len(self.saves)}
+
+    def rpc_reload_catalog(self) -> dict:
+        return {"items": self.load_catalog()}
+
+    def rpc_inspect_inventory(self, path: str) -> dict:
+        self.inventory(path)
+        inventory, loadout_table = self.session(path).tables()
+        slots = [{
+            "slot": idx,
+            "item_data": slot.item_id,
+            "item_name": self.item_name(slot.item_id),
+            "count": slot.count,
+            "durability": slot.durability,
+            "guid": slot.guid
+        } for idx, slot in inventory]
+        loadout = []
+        for idx, slot in loadout_table:
+            item_id = slot.item_id
+            if not item_id and slot.inventory_index is not None:
+                item_id = inventory.item_at(int(slot.inventory_index))
+            loadout.append({"slot": idx, "item_data": item_id, "item_name": self.item_name(item_id)})
+        return {"slots": slots, "loadout": loadout}
+
+    def rpc_plan_injection(self, path: str, queue: list) -> dict:
+        entries = self.resolve_queue(queue)
+        inventory = self.inventory(path)
+        merged, injected = build_merged_inventory(inventory, entries)
+        planned = []
+        for entry in sorted(entries, key=lambda e: e["start_slot"]):
+            for slot in range(entry["start_slot"], entry["end_slot"] + 1):
+                previous = inventory.item_at(slot)
+                planned.append({
+                    "slot": slot,
+                    "item_name": entry["item_name"],
+                    "count": entry["count"],
+                    "replaces": self.item_name(previous) or previous
+                })
+        return {"injected": injected, "slots": planned, "max_slot_index": merged.max_slot_index}
+
+    def rpc_apply_injection(self, path: str, queue: list) -> dict:
+        entries = self.resolve_queue(queue)
+        with self.lock:
+            inventory = self.inventory(path)
+            backup_path = save_io.backup_path_for(path)
+            if not os.path.exists(backup_path):
+                shutil.copyfile(path, backup_path)
+            merged, injected = build_merged_inventory(inventory, entries, GuidRegistry.for_save(path))
+            self.session(path).write_inventory(merged)
+        return {"injected": injected, "backup": backup_path}
+
+    def rpc_validate(self, path: str) -> dict:
+        section = self.inventory(path)
+        inventory, _ = self.session(path).tables()
+        problems = []
+        seen_guids = {}
+        max_slot = inventory.highest()
+        for slot, entry in inventory:
+            if slot > MAX_SLOT_INDEX:
+                problems.append({"slot": slot, "problem": f"Slot is outside 0-{MAX_SLOT_INDEX}"})
+            item = self.by_pid.get(entry.item_id)
+            if item is None:
+                problems.append({"slot": slot, "problem": f"Unknown ItemData {entry.item_id!r}"})
+            elif "MaxStackSize" in item and (entry.count or 1) > item["MaxStackSize"]:
+                problems.append({"slot": slot, "problem": f"Count {entry.count} exceeds MaxStackSize {item['MaxStackSize']}"})
+            guid = entry.guid
+            if not guid:
+                problems.append({"slot": slot, "problem": "Missing GUID"})
+            elif guid in seen_guids:
+                problems.append({"slot": slot, "problem": f"GUID {guid} duplicates slot {seen_guids[guid]}"})
+            else:
+                seen_guids[guid] = slot
+        if section.max_slot_index is not None and section.max_slot_index < max_slot:
+            problems.append({"slot": None, "problem": f"MaxSlotIndex {section.max_slot_index} is below highest slot {max_slot}"})
+        return {"valid": not problems, "problems": problems}
+
+    def rpc_restore_backup(self, path: str) -> dict:
+        backup_path = save_io.backup_path_for(path)
+        if not os.path.isfile(backup_path):
+            raise RpcError(INVALID_PARAMS, f"No backup found at {backup_path}")
+        with self.lock:
+            shutil.copyfile(backup_path, path)
+            self.forget(path)
+        return {"restored": backup_path}
+
+    def dispatch(self, request) -> dict | None:
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return {"jsonrpc": "2.0", "id": None, "error": {"code": INVALID_REQUEST, "message": "Invalid request"}}
+        request_id = request.get("id")
+        handler = getattr(self, "rpc_" + request["method"], None)
+        params = request.get("params") or {}
+        try:
+            if handler is None:
+                raise RpcError(METHOD_NOT_FOUND, f"Unknown method: {request['method']}")
+            try:
+                result = handler(*params) if isinstance(params, list) else handler(**params)
+            except TypeError as exc:
+                raise RpcError(INVALID_PARAMS, str(exc))
+        except RpcError as exc:
+            response = {"jsonrpc": "2.0", "id": request_id, "error": {"code": exc.code, "message": exc.message}}
+        except Exception as exc:
+            response = {"jsonrpc": "2.0", "id": request_id, "error": {"code": SERVER_ERROR, "message": str(exc)}}
+        else:
+            response = {"jsonrpc": "2.0", "id": request_id, "result": result}
+        return response if "id" in request else None
+
+class RpcHandler(socketserver.StreamRequestHandler):
+    def setup(self):
+        super().setup()
+        if self.connection.family in (socket.AF_INET, socket.AF_INET6):
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def reply(self, response) -> None:
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+    def handle(self):
+        state = self.server.state
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            # Browsers can reach localhost with a plain POST; never read past
+            # an HTTP request line or anything else that is not a JSON-RPC call.
+            if line.lstrip().startswith(HTTP_METHODS):
+                return
+            try:
+                request = json.loads(line)
+            except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+                self.reply({"jsonrpc": "2.0", "id": None, "error": {"code": PARSE_ERROR, "message": str(exc)}})
+                return
+            calls = request if isinstance(request, list) else [request]
+            if not calls or not all(isinstance(call, dict) for call in calls):
+                self.reply({"jsonrpc": "2.0", "id": None, "error": {"code": INVALID_REQUEST, "message": "Invalid request"}})
+                return
+            if not all(secrets.compare_digest(str(call.get("token", "")), self.server.token) for call in calls):
+                self.reply({"jsonrpc": "2.0", "id": None, "error": {"code": UNAUTHORIZED, "message": "Missing or wrong token"}})
+                return
+            if isinstance(request, list):
+                response = [r for r in map(state.dispatch, request) if r is not None] or None
+            else:
+                response = state.dispatch(request)
+            if response is not None:
+                self.reply(response)
+
+class TcpRpcServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+    class UnixRpcServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+def write_token(path: str) -> str:
+    token = secrets.token_hex(16)
+    if os.path.exists(path):
+        os.unlink(path)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w", encoding="ascii") as f:
+        f.write(token)
+    return token
+
+def read_token(path: str) -> str:
+    try:
+        with open(path, "r", encoding="ascii") as f:
+            return f.read().strip()
+    except OSError as exc:
+        raise ConnectionError(f"Cannot read the daemon token from {path}; is the daemon running? ({exc})")
+
+def make_server(state: EditorState, port: int = DEFAULT_PORT, socket_path: str | None = None,
+                token_path: str = DEFAULT_TOKEN_PATH):
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = UnixRpcServer(socket_path, RpcHandler)
+    else:
+        server = TcpRpcServer((DEFAULT_HOST, port), RpcHandler)
+    server.state = state
+    server.token = write_token(token_path)
+    return server
+
+class DaemonClient:
+    def __init__(self, port: int = DEFAULT_PORT, socket_path: str | None = None, timeout: float = 30.0,
+                 token_path: str = DEFAULT_TOKEN_PATH):
+        self._token = read_token(token_path)
+        if socket_path:
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.settimeout(timeout)
+            self._sock.connect(socket_path)
+        else:
+            self._sock = socket.create_connection((DEFAULT_HOST, port), timeout=timeout)
+            self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._file = self._sock.makefile("rwb")
+        self._next_id = 0
+
+    def call(self, method: str, **params):
+        self._next_id += 1
+        request = {"jsonrpc": "2.0", "id": self._next_id, "method": method, "params": params, "token": self._token}
+        self._file.write(json.dumps(request).encode("utf-8") + b"\n")
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("Editor daemon closed the connection")
+        response = json.loads(line)
+        if "error" in response:
+            raise RpcError(response["error"]["code"], response["error"]["message"])
+        return response["result"]
+
+    def close(self):
+        self._file.close()
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local JSON-RPC daemon for the save editor.")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="localhost TCP port")
+    parser.add_argument("--socket", dest="socket_path", help="Unix socket path (instead of TCP)")
+    parser.add_argument("--token-file", default=DEFAULT_TOKEN_PATH, help="file holding the per-run access token")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve", help="run the daemon")
+    serve.add_argument("--catalog", default=catalog.CATALOG_PATH, help="path to ItemID.txt")
+    call = sub.add_parser("call", help="send one request to a running daemon")
+    call.add_argument("method")
+    call.add_argument("params", nargs="?", default="{}", help="JSON object of parameters")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        state = EditorState(args.catalog)
+        server = make_server(state, args.port, args.socket_path, args.token_file)
+        print(f"Editor daemon listening on {args.socket_path or f'{DEFAULT_HOST}:{args.port}'} "
+              f"({len(state.by_pid)} items)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            if args.socket_path and os.path.exists(args.socket_path):
+                os.unlink(args.socket_path)
+            if os.path.exists(args.token_file):
+                os.unlink(args.token_file)
+        return 0
+
+    with DaemonClient(args.port, args.socket_path, token_path=args.token_file) as client:
+        try:
+            result = client.call(args.method, **json.loads(args.params))
+        except RpcError as exc:
+            print(f"Error {exc.code}: {exc.message}", file=sys.stderr)
+            return 1
+    print(json.dumps(result, indent=4))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
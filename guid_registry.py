@@ -0,0 +1,81 @@
+import glob
+import mmap
+import os
+import re
+import threading
+
+GUID_LENGTH = 22
+GUID_BYTES = GUID_LENGTH // 2
+BATCH_SIZE = 4096
+_GUID_RE = re.compile(rb'"GUID"\s*:\s*"([^"\\]*)"')
+
+def scan_guids(path: str) -> set[str]:
+    with open(path, "rb") as fh:
+        if os.fstat(fh.fileno()).st_size == 0:
+            return set()
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return {raw.decode("utf-8", "replace") for raw in _GUID_RE.findall(mm)}
+
+class GuidRegistry:
+    def __init__(self, existing=()):
+        self.known = set(existing)
+        self.pool = []
+        self.lock = threading.Lock()
+
+    @classmethod
+    def for_save(cls, path: str) -> "GuidRegistry":
+        registry = cls()
+        registry.add_save(path)
+        return registry
+
+    @classmethod
+    def for_directory(cls, directory: str) -> "GuidRegistry":
+        registry = cls()
+        registry.add_directory(directory)
+        return registry
+
+    def add_save(self, path: str) -> int:
+        found = scan_guids(path)
+        with self.lock:
+            before = len(self.known)
+            self.known |= found
+            return len(self.known) - before
+
+    def add_directory(self, directory: str) -> int:
+        added = 0
+        for path in glob.glob(os.path.join(glob.escape(directory), "**", "*.json"), recursive=True):
+            try:
+                added += self.add_save(path)
+            except OSError as e:
+                print(f"Skipping {path} while indexing GUIDs: {e}")
+        return added
+
+    def add(self, guid: str) -> None:
+        with self.lock:
+            self.known.add(guid)
+
+    def __contains__(self, guid: str) -> bool:
+        return guid in self.known
+
+    def __len__(self) -> int:
+        return len(self.known)
+
+    def _refill(self, wanted: int) -> None:
+        count = max(wanted, BATCH_SIZE)
+        text = os.urandom(count * GUID_BYTES).hex()
+        self.pool.extend(text[i:i + GUID_LENGTH] for i in range(0, len(text), GUID_LENGTH))
+
+    def allocate(self, n: int) -> list[str]:
+        out = []
+        with self.lock:
+            while len(out) < n:
+                if not self.pool:
+                    self._refill(n - len(out))
+                guid = self.pool.pop()
+                if guid not in self.known:
+                    self.known.add(guid)
+                    out.append(guid)
+        return out
+
+    def allocate_one(self) -> str:
+        return self.allocate(1)[0]
@@ -0,0 +1,120 @@
+import csv
+import json
+import os
+
+from guid_registry import GuidRegistry
+from slot_model import Slot, SlotTable
+
+PRESET_FIELDS = ("item_name", "persistence_id", "count", "start_slot", "end_slot", "durability")
+
+def make_queue_entry(item_name: str, item_data: dict, count: int, start_slot: int, end_slot: int,
+                     durability: int | None) -> dict:
+    return {
+        "item_name": item_name,
+        "persistence_id": item_data["PersistenceID"],
+        "count": count,
+        "start_slot": start_slot,
+        "end_slot": end_slot,
+        "durability": durability,
+        "vitalshield": item_data.get("VitalShield")
+    }
+
+def build_merged_inventory(inventory: SlotTable, entries: list[dict],
+                           registry: GuidRegistry | None = None) -> tuple[SlotTable, int]:
+    # Slots are replaced, never edited in place, so the copy can share them with the cached table.
+    table = inventory.copy()
+    if registry is None:
+        registry = GuidRegistry(slot.guid for _, slot in table if slot.guid)
+    guids = iter(registry.allocate(sum(max(0, e["end_slot"] - e["start_slot"] + 1) for e in entries)))
+    injected = set()
+    for entry in sorted(entries, key=lambda e: e["start_slot"]):
+        for slot in range(entry["start_slot"], entry["end_slot"] + 1):
+            table[slot] = Slot(
+                entry["persistence_id"],
+                guid=next(guids),
+                count=entry["count"] or None,
+                durability=entry["durability"] or None,
+                vital_shield=entry["vitalshield"]
+            )
+            injected.add(slot)
+    table.max_slot_index = max(table.max_slot_index or 0, table.highest(), 0)
+    return table, len(injected)
+
+def _int_or_none(value) -> int | None:
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    return int(value)
+
+def read_preset(path: str) -> list[dict]:
+    if os.path.splitext(path)[1].lower() == ".csv":
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            return list(csv.DictReader(f))
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("queue", [])
+    if not isinstance(data, list) or not all(isinstance(row, dict) for row in data):
+        raise ValueError("Preset must be a list of queue entry objects.")
+    return data
+
+class InjectionQueue:
+    def __init__(self):
+        self.entries = []
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __getitem__(self, index):
+        return self.entries[index]
+
+    def append(self, entry: dict) -> None:
+        self.entries.append(entry)
+
+    def remove(self, index: int) -> None:
+        del self.entries[index]
+
+    def update(self, index: int, **fields) -> None:
+        self.entries[index] = {**self.entries[index], **fields}
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def load_preset(self, path: str, resolve) -> list[dict]:
+        entries, skipped = [], []
+        for row in read_preset(path):
+            resolved = resolve(row.get("item_name"), row.get("persistence_id"))
+            if resolved is None:
+                skipped.append(row)
+                continue
+            item_name, item_data = resolved
+            try:
+                start_slot = int(row["start_slot"])
+                end_slot = _int_or_none(row.get("end_slot"))
+                count = _int_or_none(row.get("count"))
+                durability = _int_or_none(row.get("durability"))
+            except (KeyError, TypeError, ValueError):
+                skipped.append(row)
+                continue
+            entries.append(make_queue_entry(
+                item_name, item_data,
+                1 if count is None else count,
+                start_slot,
+                start_slot if end_slot is None else end_slot,
+                durability
+            ))
+        self.entries = entries
+        return skipped
+
+    def save_preset(self, path: str) -> None:
+        rows = [{field: entry.get(field) for field in PRESET_FIELDS} for entry in self.entries]
+        if os.path.splitext(path)[1].lower() == ".csv":
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=PRESET_FIELDS)
+                writer.writeheader()
+                writer.writerows(rows)
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(rows, f, indent=4)
@@ -0,0 +1,144 @@
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+
+import numpy as np
+
+import save_io
+from item_catalog import ItemCatalog
+
+POWER_LEVELS = 5
+# Bucket 0 holds items without a PowerLevel (stored as MISSING in the catalog).
+POWER_BUCKETS = ("no_power",) + tuple(f"power_{lvl}" for lvl in range(1, POWER_LEVELS))
+
+class InventoryTable:
+    def __init__(self, paths: list[str], save_idx, slot, item_idx, count):
+        self.paths = paths
+        self.save_idx = save_idx
+        self.slot = slot
+        self.item_idx = item_idx
+        self.count = count
+
+def load_inventories(paths: list[str], arrays: ItemCatalog) -> InventoryTable:
+    save_idx, slot, item_idx, count = [], [], [], []
+    loaded = []
+    for path in paths:
+        try:
+            inv_dict, _ = save_io.inventory_view(save_io.read_inventory_sections(path))
+        except (OSError, ValueError) as exc:
+            print(f"Skipping {path}: {exc}", file=sys.stderr)
+            continue
+        s = len(loaded)
+        loaded.append(path)
+        for idx_str, entry in inv_dict.items():
+            if not idx_str.isdigit():
+                continue
+            save_idx.append(s)
+            slot.append(int(idx_str))
+            item_idx.append(arrays.index.get(entry.get("ItemData"), -1))
+            count.append(entry.get("Count") or 1)
+    return InventoryTable(
+        loaded,
+        np.array(save_idx, dtype=np.int32),
+        np.array(slot, dtype=np.int16),
+        np.array(item_idx, dtype=np.int32),
+        np.array(count, dtype=np.int64)
+    )
+
+def analyze(table: InventoryTable, arrays: ItemCatalog) -> dict:
+    n_saves = len(table.paths)
+    n_items = len(arrays.ids)
+    known = table.item_idx >= 0
+    save_idx = table.save_idx[known]
+    item_idx = table.item_idx[known]
+    count = table.count[known]
+
+    carried_weight = np.bincount(save_idx, weights=np.nan_to_num(arrays.weight[item_idx]).astype(np.float64) * count, minlength=n_saves)
+    slots_used = np.bincount(table.save_idx, minlength=n_saves)
+    unknown_slots = np.bincount(table.save_idx[~known], minlength=n_saves)
+
+    power = arrays.power[item_idx].astype(np.int64)
+    power_hist = np.bincount(save_idx * POWER_LEVELS + np.where(power < 1, 0, np.minimum(power, POWER_LEVELS - 1)),
+                             minlength=n_saves * POWER_LEVELS).reshape(n_saves, POWER_LEVELS)
+
+    max_stack = arrays.max_stack[item_idx]
+    overflow = (max_stack > 0) & (count > max_stack)
+    stack_overflows = np.bincount(save_idx[overflow], minlength=n_saves)
+
+    pairs = np.unique(save_idx.astype(np.int64) * n_items + item_idx)
+    saves_with_item = np.bincount(pairs % n_items, minlength=n_items) if n_items else np.zeros(0, dtype=np.int64)
+    total_count = np.bincount(item_idx, weights=count, minlength=n_items)
+
+    saves = [{
+        "path": path,
+        "slots_used": int(slots_used[i]),
+        "unknown_slots": int(unknown_slots[i]),
+        "carried_weight": round(float(carried_weight[i]), 3),
+        "stack_overflows": int(stack_overflows[i]),
+        **{bucket: int(power_hist[i, lvl]) for lvl, bucket in enumerate(POWER_BUCKETS)}
+    } for i, path in enumerate(table.paths)]
+
+    order = np.argsort(-saves_with_item, kind="stable")
+    items = [{
+        "persistence_id": arrays.ids[i],
+        "name": arrays.names[i],
+        "saves_with_item": int(saves_with_item[i]),
+        "prevalence": round(float(saves_with_item[i]) / n_saves, 4) if n_saves else 0.0,
+        "total_count": int(total_count[i])
+    } for i in order if saves_with_item[i]]
+
+    return {
+        "saves": saves,
+        "items": items,
+        "power_distribution": {bucket: int(power_hist[:, lvl].sum()) for lvl, bucket in enumerate(POWER_BUCKETS)}
+    }
+
+def collect_paths(targets: list[str]) -> list[str]:
+    paths = []
+    for target in targets:
+        if os.path.isdir(target):
+            paths += sorted(p for p in glob.glob(os.path.join(glob.escape(target), "**", "*.json"), recursive=True)
+                            if "_backup" not in os.path.basename(p))
+        else:
+            paths.append(target)
+    return paths
+
+def write_csv(report: dict, prefix: str) -> list[str]:
+    written = []
+    for key in ("saves", "items"):
+        rows = report[key]
+        if not rows:
+            continue
+        path = f"{prefix}_{key}.csv"
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+            writer.writeheader()
+            writer.writerows(rows)
+        written.append(path)
+    return written
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aggregate inventory weight, power and stack statistics across saves.")
+    parser.add_argument("targets", nargs="+", help="save files or directories of saves")
+    parser.add_argument("--json", dest="json_path", help="write the full report as JSON")
+    parser.add_argument("--csv", dest="csv_prefix", help="write <prefix>_saves.csv and <prefix>_items.csv")
+    args = parser.parse_args(argv)
+
+    arrays = ItemCatalog.load()
+    table = load_inventories(collect_paths(args.targets), arrays)
+    report = analyze(table, arrays)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4)
+    if args.csv_prefix:
+        write_csv(report, args.csv_prefix)
+    if not (args.json_path or args.csv_prefix):
+        print(json.dumps(report, indent=4))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
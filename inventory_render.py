@@ -0,0 +1,211 @@
+import argparse
+import os
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, ImageDraw, ImageFont
+
+import catalog
+import save_io
+
+ASSETS_DIR = os.path.join(os.path.dirname(catalog.DATA_DIR), "assets")
+SLOT_ICON_SIZE = 58
+SLOT_PITCH = SLOT_ICON_SIZE + 10
+MARGIN = 24
+TAB_SIZE = (96, 48)
+TAB_SECTIONS = (("main", 8, "T_Icon_Items_Highlight.png"),
+            ("rune", 32, "T_Icon_Runes_Highlight.png"),
+            ("quest", 56, "T_Icon_Quests_Highlight.png"))
+LOADOUT_MASKS = (("T_Inventory_EquipmentHelmet.png", 48), ("T_Inventory_EquipmentBody.png", 48),
+                 ("T_Inventory_EquipmentLegs.png", 48), ("T_Inventory_EquipmentCape.png", 48),
+                 ("T_Inventory_EquipmentTrinket.png", 32))
+SLOT_FILL = (68, 68, 68, 255)
+SLOT_EDGE = (34, 34, 34, 255)
+TILE_CACHE_MAX = 256
+
+def load_badge_font() -> ImageFont.ImageFont:
+    for name in ("consolab.ttf", "Consolas Bold.ttf", "DejaVuSansMono-Bold.ttf"):
+        try:
+            return ImageFont.truetype(name, 13)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+def compose_tile(icon: Image.Image, badge: Image.Image | None, count: int | None, font,
+                 size: int = SLOT_ICON_SIZE) -> Image.Image:
+    img = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    img.alpha_composite(icon)
+    if badge is not None:
+        img.alpha_composite(badge, (0, 0))
+    if count is not None:
+        draw = ImageDraw.Draw(img)
+        text = str(count)
+        left, top, right, bottom = draw.textbbox((0, 0), text, font=font)
+        w, h = right - left + 4, bottom - top + 2
+        x0, y0 = size - w, size - h
+        draw.rectangle((x0, y0, size, size), fill="#444")
+        draw.text((x0 + 2 - left, y0 + 1 - top), text, font=font, fill="white")
+    return img
+
+class IconCache:
+    def __init__(self, assets_dir: str = ASSETS_DIR):
+        self.assets_dir = assets_dir
+        self.images = {}
+
+    def get(self, name: str, size: tuple[int, int], ui: bool = False) -> Image.Image | None:
+        key = (name, size, ui)
+        if key not in self.images:
+            path = os.path.join(self.assets_dir, "UI", name) if ui else os.path.join(self.assets_dir, name)
+            try:
+                self.images[key] = Image.open(path).convert("RGBA").resize(size, Image.LANCZOS)
+            except OSError as e:
+                print(f"Failed to load {path}: {e}", file=sys.stderr)
+                self.images[key] = None
+        return self.images[key]
+
+class InventoryRenderer:
+    def __init__(self, entries: list[dict], assets_dir: str = ASSETS_DIR):
+        self.icons = IconCache(assets_dir)
+        self.icon_files = {e["PersistenceID"]: e["IconFile"] for e in entries if e.get("PersistenceID") and e.get("IconFile")}
+        self.powers = {e["PersistenceID"]: e["PowerLevel"] for e in entries if e.get("PersistenceID") and e.get("PowerLevel")}
+        self.font = load_badge_font()
+        self.tiles = OrderedDict()
+        self.width = MARGIN * 2 + SLOT_PITCH * 8
+        self.height = MARGIN * 2 + SLOT_PITCH * (1 + 3 * len(TAB_SECTIONS) + 1) + (TAB_SIZE[1] + 8) * len(TAB_SECTIONS)
+        self._background = None
+
+    def tile(self, item_id: str | None, count: int | None = None) -> Image.Image | None:
+        if not item_id:
+            return None
+        power = self.powers.get(item_id)
+        key = (item_id, count, power)
+        if key in self.tiles:
+            self.tiles.move_to_end(key)
+            return self.tiles[key]
+        icon_file = self.icon_files.get(item_id)
+        icon = self.icons.get(icon_file, (SLOT_ICON_SIZE, SLOT_ICON_SIZE), ui=True) if icon_file else None
+        badge = self.icons.get(f"PowerLevel{power}.png", (25, 25)) if power else None
+        tile = self.tiles[key] = compose_tile(icon, badge, count, self.font) if icon else None
+        if len(self.tiles) > TILE_CACHE_MAX:
+            self.tiles.popitem(last=False)
+        return tile
+
+    def background(self) -> Image.Image:
+        if self._background is None:
+            panel = self.icons.get("T_Inventory_PanelBackground.png", (self.width, self.height))
+            self._background = panel if panel is not None else Image.new("RGBA", (self.width, self.height), "#1c1b18")
+        return self._background
+
+    def _slot(self, img: Image.Image, x: int, y: int, tile: Image.Image | None, mask: Image.Image | None = None) -> None:
+        draw = ImageDraw.Draw(img)
+        draw.rectangle((x - 3, y - 3, x + SLOT_ICON_SIZE + 2, y + SLOT_ICON_SIZE + 2), fill=SLOT_FILL, outline=SLOT_EDGE, width=2)
+        if tile is None:
+            tile = mask
+        if tile is not None:
+            img.alpha_composite(tile, (x + (SLOT_ICON_SIZE - tile.width) // 2, y + (SLOT_ICON_SIZE - tile.height) // 2))
+
+    def render(self, inventory, loadout) -> Image.Image:
+        img = self.background().copy()
+        y = MARGIN
+        for col in range(8):
+            slot = inventory[col]
+            self._slot(img, MARGIN + col * SLOT_PITCH + 5, y + 5, self.tile(slot.item_id, slot.count) if slot else None)
+        y += SLOT_PITCH
+
+        for _, start, tab_file in TAB_SECTIONS:
+            tab = self.icons.get(tab_file, TAB_SIZE)
+            if tab is not None:
+                img.alpha_composite(tab, ((self.width - TAB_SIZE[0]) // 2, y + 4))
+            y += TAB_SIZE[1] + 8
+            for row in range(3):
+                for col in range(8):
+                    slot = inventory[start + row * 8 + col]
+                    self._slot(img, MARGIN + col * SLOT_PITCH + 5, y + 5, self.tile(slot.item_id, slot.count) if slot else None)
+                y += SLOT_PITCH
+
+        loadout_x = (self.width - SLOT_PITCH * len(LOADOUT_MASKS)) // 2
+        for i, (mask_file, mask_size) in enumerate(LOADOUT_MASKS):
+            slot = loadout[i]
+            tile = None
+            if slot:
+                item_id = slot.item_id
+                if not item_id and slot.inventory_index is not None:
+                    item_id = inventory.item_at(int(slot.inventory_index))
+                tile = self.tile(item_id, slot.count)
+            self._slot(img, loadout_x + i * SLOT_PITCH + 5, y + 5, tile, self.icons.get(mask_file, (mask_size, mask_size)))
+        return img
+
+    def render_save(self, path: str) -> Image.Image:
+        session = save_io.SaveSession(path)
+        return self.render(*session.tables())
+
+_worker_renderer = None
+
+def _init_worker(catalog_path: str, assets_dir: str) -> None:
+    global _worker_renderer
+    _worker_renderer = InventoryRenderer(catalog.read_item_entries(catalog_path), assets_dir)
+
+def _render_one(job: tuple[str, str]) -> tuple[str, str | None, str | None]:
+    path, out_path = job
+    try:
+        img = _worker_renderer.render_save(path)
+        if out_path.endswith(".jpg"):
+            img = img.convert("RGB")
+        img.save(out_path)
+    except Exception as e:
+        return path, None, f"{type(e).__name__}: {e}"
+    return path, out_path, None
+
+def output_paths_for(paths: list[str], out_dir: str, fmt: str) -> list[str]:
+    # Name each image after the save's path relative to the saves' common folder,
+    # so same-named characters from different directories do not overwrite each other.
+    full = [os.path.abspath(path) for path in paths]
+    try:
+        base = os.path.commonpath([os.path.dirname(path) for path in full]) if full else ""
+    except ValueError:
+        base = ""
+    names = []
+    for path in full:
+        rel = os.path.relpath(path, base) if base else os.path.splitdrive(path)[1].lstrip(os.sep)
+        names.append(os.path.splitext(rel)[0].replace(os.sep, "__") + "." + fmt)
+    return [os.path.join(out_dir, name) for name in names]
+
+def render_batch(paths: list[str], out_dir: str, workers: int | None = None, fmt: str = "png",
+                 catalog_path: str = catalog.CATALOG_PATH, assets_dir: str = ASSETS_DIR) -> list[tuple]:
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = list(zip(paths, output_paths_for(paths, out_dir, fmt)))
+    if workers == 1:
+        _init_worker(catalog_path, assets_dir)
+        return [_render_one(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(catalog_path, assets_dir)) as pool:
+        chunksize = max(1, len(jobs) // ((workers or os.cpu_count() or 1) * 8))
+        return list(pool.map(_render_one, jobs, chunksize=chunksize))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render inventory and loadout images for saves without the editor UI.")
+    parser.add_argument("saves", nargs="+", help="save files or directories of saves")
+    parser.add_argument("-o", "--out", default="renders", help="output directory")
+    parser.add_argument("-j", "--workers", type=int, help="worker processes (default: one per CPU, 1 = in-process)")
+    parser.add_argument("--format", default="png", choices=("png", "webp", "jpg"))
+    args = parser.parse_args(argv)
+
+    paths = []
+    for target in args.saves:
+        if os.path.isdir(target):
+            paths += sorted(os.path.join(target, name) for name in os.listdir(target)
+                            if name.endswith(".json") and "_backup" not in name)
+        else:
+            paths.append(target)
+
+    failures = 0
+    for path, out_path, error in render_batch(paths, args.out, args.workers, args.format):
+        if error:
+            failures += 1
+            print(f"{path}: {error}", file=sys.stderr)
+        else:
+            print(f"{path} -> {out_path}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
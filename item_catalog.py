@@ -0,0 +1,130 @@
+import argparse
+import json
+import sys
+
+import numpy as np
+
+import catalog
+
+MISSING = -1
+INT_FIELDS = (("PowerLevel", "power", np.int8), ("MaxStackSize", "max_stack", np.int32),
+              ("VitalShield", "vital_shield", np.int32), ("BaseDurability", "base_durability", np.int32))
+SORT_KEYS = ("category", "power", "max_stack", "weight", "name")
+
+class ItemCatalog:
+    def __init__(self, entries: list[dict]):
+        entries = [e for e in entries if e.get("PersistenceID")]
+        self.ids = [sys.intern(e["PersistenceID"]) for e in entries]
+        self.names = [sys.intern(e.get("SourceString", "").strip()) for e in entries]
+        self.icons = [sys.intern(e.get("IconFile") or "") for e in entries]
+        raw_categories = [e.get("Category", "Miscellaneous") for e in entries]
+        self.categories = [sys.intern(c) for c in sorted(set(raw_categories))]
+        codes = {c: i for i, c in enumerate(self.categories)}
+        self.category = np.array([codes[c] for c in raw_categories], dtype=np.int16)
+        self.weight = np.array([e["Weight"] if e.get("Weight") is not None else np.nan for e in entries], dtype=np.float32)
+        for key, attr, dtype in INT_FIELDS:
+            values = [e.get(key) for e in entries]
+            setattr(self, attr, np.array([MISSING if v is None else v for v in values], dtype=dtype))
+        self.search_names = np.array([n.lower() for n in self.names], dtype=str)
+        self.name_rank = np.argsort(np.argsort(self.search_names, kind="stable"), kind="stable")
+        self.index = {pid: i for i, pid in enumerate(self.ids)}
+        self.name_index = {name: i for i, name in enumerate(self.names) if name}
+
+    @classmethod
+    def load(cls, path: str = catalog.CATALOG_PATH) -> "ItemCatalog":
+        return cls(catalog.read_item_entries(path))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def category_code(self, name: str) -> int | None:
+        lowered = name.lower()
+        for code, category in enumerate(self.categories):
+            if category.lower() == lowered:
+                return code
+        return None
+
+    def mask(self, category: str | None = None, min_power: int | None = None, max_power: int | None = None,
+             stackable: bool | None = None, text: str | None = None) -> np.ndarray:
+        mask = np.ones(len(self), dtype=bool)
+        if category is not None:
+            code = self.category_code(category)
+            if code is None:
+                return np.zeros(len(self), dtype=bool)
+            mask &= self.category == code
+        if min_power is not None:
+            mask &= self.power >= min_power
+        if max_power is not None:
+            mask &= (self.power != MISSING) & (self.power <= max_power)
+        if stackable is not None:
+            mask &= (self.max_stack > 1) == stackable
+        if text:
+            mask &= np.char.find(self.search_names, text.lower()) >= 0
+        return mask
+
+    def sort_key(self, key: str) -> np.ndarray:
+        if key == "name":
+            return self.name_rank
+        if key == "weight":
+            return np.nan_to_num(self.weight, nan=-1.0)
+        return getattr(self, key)
+
+    def select(self, sort_by: tuple[str, ...] = ("category", "name"), descending: bool = False, **filters) -> np.ndarray:
+        indices = np.flatnonzero(self.mask(**filters))
+        if sort_by and len(indices):
+            keys = [self.sort_key(k)[indices] for k in reversed(sort_by)]
+            order = np.lexsort(keys)
+            indices = indices[order[::-1] if descending else order]
+        return indices
+
+    def entry(self, i: int) -> dict:
+        entry = {
+            "SourceString": self.names[i],
+            "PersistenceID": self.ids[i]
+        }
+        if not np.isnan(self.weight[i]):
+            entry["Weight"] = round(float(self.weight[i]), 6)
+        for key, attr, _ in INT_FIELDS:
+            value = int(getattr(self, attr)[i])
+            if value != MISSING:
+                entry[key] = value
+        if self.icons[i]:
+            entry["IconFile"] = self.icons[i]
+        entry["Category"] = self.categories[self.category[i]]
+        return entry
+
+    def entries(self, indices) -> list[dict]:
+        return [self.entry(int(i)) for i in indices]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Filter and sort ItemID.txt entries.")
+    parser.add_argument("--catalog", default=catalog.CATALOG_PATH)
+    parser.add_argument("--category")
+    parser.add_argument("--min-power", type=int)
+    parser.add_argument("--max-power", type=int)
+    parser.add_argument("--stackable", action="store_true", default=None)
+    parser.add_argument("--search", help="case-insensitive name substring")
+    parser.add_argument("--sort", default="category,name", help=f"comma-separated keys from {', '.join(SORT_KEYS)}")
+    parser.add_argument("--desc", action="store_true", help="sort descending")
+    parser.add_argument("--json", action="store_true", help="print matching entries as JSON")
+    args = parser.parse_args(argv)
+
+    sort_by = tuple(k for k in args.sort.split(",") if k)
+    unknown = [k for k in sort_by if k not in SORT_KEYS]
+    if unknown:
+        parser.error(f"unknown sort key(s): {', '.join(unknown)}")
+
+    items = ItemCatalog.load(args.catalog)
+    indices = items.select(sort_by, args.desc, category=args.category, min_power=args.min_power,
+                           max_power=args.max_power, stackable=args.stackable, text=args.search)
+    if args.json:
+        print(json.dumps(items.entries(indices), indent=4))
+    else:
+        for i in indices:
+            power = items.power[i]
+            print(f"{items.names[i]:32} {items.categories[items.category[i]]:14} "
+                  f"power {power if power != MISSING else '-':>2}  stack {items.max_stack[i] if items.max_stack[i] != MISSING else '-':>4}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+from collections import OrderedDict
+
+import catalog
+import save_io
+
+SLOT_FIELDS = ("GUID", "ItemData", "Count", "Durability", "VitalShield")
+LOADOUT_FIELDS = SLOT_FIELDS + ("PlayerInventoryItemIndex",)
+SNAPSHOT_CACHE = OrderedDict()
+SNAPSHOT_CACHE_MAX = 16
+
+def _slot_hash(entry: dict, fields: tuple) -> bytes:
+    payload = json.dumps([entry.get(f) for f in fields], separators=(",", ":"), sort_keys=True)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=8).digest()
+
+def _section_digest(hashes: dict) -> bytes:
+    h = hashlib.blake2b(digest_size=16)
+    for slot in sorted(hashes):
+        h.update(slot.to_bytes(4, "little", signed=True))
+        h.update(hashes[slot])
+    return h.digest()
+
+class SaveSnapshot:
+    def __init__(self, path: str, inv_dict: dict, loadout_dict: dict):
+        self.path = path
+        self.inventory = {int(k): v for k, v in inv_dict.items() if k.isdigit()}
+        self.loadout = {int(k): v for k, v in loadout_dict.items() if k.isdigit()}
+        self.slot_hashes = {slot: _slot_hash(e, SLOT_FIELDS) for slot, e in self.inventory.items()}
+        self.loadout_hashes = {slot: _slot_hash(e, LOADOUT_FIELDS) for slot, e in self.loadout.items()}
+        self.inventory_digest = _section_digest(self.slot_hashes)
+        self.loadout_digest = _section_digest(self.loadout_hashes)
+
+def snapshot(path: str) -> SaveSnapshot:
+    st = os.stat(path)
+    fingerprint = (st.st_mtime_ns, st.st_size)
+    cached = SNAPSHOT_CACHE.get(path)
+    if cached and cached[0] == fingerprint:
+        SNAPSHOT_CACHE.move_to_end(path)
+        return cached[1]
+    snap = SaveSnapshot(path, *save_io.inventory_view(save_io.read_inventory_sections(path)))
+    SNAPSHOT_CACHE[path] = (fingerprint, snap)
+    SNAPSHOT_CACHE.move_to_end(path)
+    if len(SNAPSHOT_CACHE) > SNAPSHOT_CACHE_MAX:
+        SNAPSHOT_CACHE.popitem(last=False)
+    return snap
+
+def _diff_section(section: str, before: dict, after: dict, before_hashes: dict, after_hashes: dict,
+                  fields: tuple) -> list[dict]:
+    changes = []
+    for slot in sorted(before_hashes.keys() | after_hashes.keys()):
+        old_hash, new_hash = before_hashes.get(slot), after_hashes.get(slot)
+        if old_hash == new_hash:
+            continue
+        old, new = before.get(slot), after.get(slot)
+        if old is None:
+            kind, changed = "added", [f for f in fields if f in new]
+        elif new is None:
+            kind, changed = "removed", [f for f in fields if f in old]
+        else:
+            kind, changed = "changed", [f for f in fields if old.get(f) != new.get(f)]
+        changes.append({
+            "section": section,
+            "slot": slot,
+            "change": kind,
+            "fields": changed,
+            "before": {f: old.get(f) for f in fields if f in old} if old else None,
+            "after": {f: new.get(f) for f in fields if f in new} if new else None
+        })
+    return changes
+
+def diff_snapshots(a: SaveSnapshot, b: SaveSnapshot) -> list[dict]:
+    changes = []
+    if a.inventory_digest != b.inventory_digest:
+        changes += _diff_section("inventory", a.inventory, b.inventory, a.slot_hashes, b.slot_hashes, SLOT_FIELDS)
+    if a.loadout_digest != b.loadout_digest:
+        changes += _diff_section("loadout", a.loadout, b.loadout, a.loadout_hashes, b.loadout_hashes, LOADOUT_FIELDS)
+    return changes
+
+def diff_saves(path_a: str, path_b: str) -> dict:
+    return {"a": path_a, "b": path_b, "changes": diff_snapshots(snapshot(path_a), snapshot(path_b))}
+
+def find_backups(path: str) -> list[str]:
+    stem = os.path.splitext(path)[0]
+    backups = glob.glob(glob.escape(stem) + "_backup*.json")
+    return sorted(backups, key=os.path.getmtime, reverse=True)
+
+def format_report(report: dict, names: dict | None = None) -> str:
+    names = names or {}
+
+    def describe(entry):
+        if not entry:
+            return "empty"
+        item_id = entry.get("ItemData")
+        if not item_id and "PlayerInventoryItemIndex" in entry:
+            return f"inventory slot {entry['PlayerInventoryItemIndex']}"
+        text = names.get(item_id, item_id) or "?"
+        if entry.get("Count") is not None:
+            text += f" x{entry['Count']}"
+        if entry.get("Durability") is not None:
+            text += f" (durability {entry['Durability']})"
+        return text
+
+    lines = [f"{report['a']} -> {report['b']}"]
+    if not report["changes"]:
+        lines.append("  no changes")
+    for change in report["changes"]:
+        lines.append(
+            f"  {change['section']} slot {change['slot']}: {change['change']} "
+            f"{describe(change['before'])} -> {describe(change['after'])}"
+            + (f" [{', '.join(change['fields'])}]" if change["change"] == "changed" else "")
+        )
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare save inventories and loadouts slot by slot.")
+    parser.add_argument("save", help="save file to compare")
+    parser.add_argument("others", nargs="*", help="saves or backups to compare against")
+    parser.add_argument("--backups", action="store_true", help="also compare against every *_backup*.json of the save")
+    parser.add_argument("--json", action="store_true", help="print a JSON report")
+    args = parser.parse_args(argv)
+
+    others = list(args.others)
+    if args.backups:
+        others += [p for p in find_backups(args.save) if p not in others]
+    if not others:
+        parser.error("nothing to compare against (pass files or --backups)")
+
+    reports = [diff_saves(other, args.save) for other in others]
+    if args.json:
+        print(json.dumps(reports, indent=4))
+    else:
+        try:
+            names = {pid: e.get("SourceString") for pid, e in catalog.index_by_persistence_id(catalog.read_item_entries()).items()}
+        except (OSError, ValueError):
+            names = {}
+        print("\n\n".join(format_report(report, names) for report in reports))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,13 +2,23 @@ import tkinter as tk
 from tkinter import filedialog, messagebox
 from tkinter import ttk
 import json
-import uuid
 import os
+import queue
+import shutil
 import sys
+import threading
 import webbrowser
 from collections import OrderedDict
-from PIL import Image, ImageTk
+from PIL import Image, ImageTk, ImageFont
 import time
+import catalog
+import inventory_render
+import save_diff
+import save_io
+from stall_monitor import StallMonitor
+from guid_registry import GuidRegistry
+from injection import InjectionQueue, build_merged_inventory, make_queue_entry
+from slot_model import SlotTable
 
 class ToolTip:
     def __init__(self, widget, text):
@@ -35,26 +45,167 @@ class ToolTip:
             tw.destroy()
             self.tipwindow = None
 
+def set_tooltip(widget, text: str | None) -> None:
+    # Reuse one ToolTip per widget; rebinding on every render leaks Tcl commands.
+    tip = getattr(widget, "_tooltip", None)
+    if tip is None:
+        if text:
+            widget._tooltip = ToolTip(widget, text)
+        return
+    tip.hide_tip()
+    tip.text = text
+
+class QueueView:
+    def __init__(self, parent, model, rows=5):
+        self.model = model
+        self.rows = rows
+        self.offset = 0
+        self.frame = tk.Frame(parent, bg="#1c1b18")
+        self.tree = ttk.Treeview(
+            self.frame,
+            columns=("slots", "item", "count", "durability"),
+            show="headings",
+            height=rows,
+            selectmode="browse"
+        )
+        for column, heading, width in (("slots", "Slots", 80), ("item", "Item", 280),
+                                       ("count", "Count", 60), ("durability", "Durability", 80)):
+            self.tree.heading(column, text=heading)
+            self.tree.column(column, width=width, stretch=column == "item")
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self.on_scrollbar)
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.row_ids = [self.tree.insert("", "end", values=("", "", "", "")) for _ in range(rows)]
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1))
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-1))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(1))
+
+    def refresh(self):
+        total = len(self.model)
+        self.offset = max(0, min(self.offset, total - self.rows))
+        for i, iid in enumerate(self.row_ids):
+            index = self.offset + i
+            if index < total:
+                entry = self.model[index]
+                slots = f"[{entry['start_slot']}]" if entry['start_slot'] == entry['end_slot'] else f"[{entry['start_slot']}-{entry['end_slot']}]"
+                values = (slots, entry["item_name"], entry["count"] or "", entry["durability"] or "")
+            else:
+                values = ("", "", "", "")
+            self.tree.item(iid, values=values)
+        if total > self.rows:
+            self.scrollbar.set(self.offset / total, (self.offset + self.rows) / total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def scroll(self, rows):
+        selected = self.selected_index()
+        self.offset += rows
+        self.refresh()
+        self.tree.selection_set(())
+        if selected is not None and self.offset <= selected < self.offset + self.rows:
+            self.tree.selection_set(self.row_ids[selected - self.offset])
+        return "break"
+
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.offset = int(float(amount) * len(self.model))
+            self.refresh()
+        else:
+            step = self.rows if unit == "pages" else 1
+            self.scroll(int(amount) * step)
+
+    def selected_index(self):
+        selection = self.tree.selection()
+        if not selection:
+            return None
+        index = self.offset + self.row_ids.index(selection[0])
+        return index if index < len(self.model) else None
+
 def resource_path(relative_path):
     base_path = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
     return os.path.join(base_path, relative_path)
 
 ASSETS_DIR = resource_path("assets")
 UI_DIR = os.path.join(ASSETS_DIR, "UI")
-DATA_DIR = resource_path("data")
+DATA_DIR = os.environ.get("RSD_DATA_DIR") or resource_path("data")
+CATALOG_FILE = os.path.join(DATA_DIR, "ItemID.txt")
+CATALOG_POLL_MS = 1000
 SLOT_ICON_SIZE = 58
 ICON_MAP, POWER_MAP = {}, {}
 POWER_BADGES = {}
 ICON_CACHE = {}
+SLOT_ICON_CACHE = {}
+TILE_CACHE = OrderedDict()
+TILE_CACHE_MAX = 256
+DIFF_COLORS = {"added": "#3c9a3c", "removed": "#b03030", "changed": "gold"}
+BADGE_FONT = None
 ITEM_ICON_SIZE = 32
 SELECTED_ICON_SIZE = int(ITEM_ICON_SIZE * 1.2)
 PLACEHOLDER_ICON = None
 PLACEHOLDER_ICON_SELECTED = None
 
-injection_queue = []
+injection_queue = InjectionQueue()
+save_session = None
+active_tasks = {}
+progress_task = None
+TASK_POLL_MS = 50
+
+class TaskCancelled(Exception):
+    pass
 
-def generate_guid():
-    return uuid.uuid4().hex[:22]
+class BackgroundTask:
+    def __init__(self, widget, work, on_done, on_error=None, on_progress=None, writes=False):
+        self.widget = widget
+        self.work = work
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.writes = writes
+        self.cancelled = threading.Event()
+        self._results = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._poll_id = widget.after(TASK_POLL_MS, self._poll)
+
+    def _run(self):
+        try:
+            result = self.work(self._report, self.cancelled)
+        except Exception as exc:
+            self._results.put(("error", exc))
+        else:
+            self._results.put(("done", result))
+
+    def _report(self, fraction, message="", cancellable=True):
+        self._results.put(("progress", (fraction, message, cancellable)))
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def _poll(self):
+        while True:
+            try:
+                kind, payload = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                if self.on_progress and not self.cancelled.is_set():
+                    self.on_progress(*payload)
+                continue
+            self._poll_id = None
+            if kind == "error" and not isinstance(payload, TaskCancelled):
+                if self.on_error:
+                    self.on_error(payload)
+            elif kind == "done" and (self.writes or not self.cancelled.is_set()):
+                # A finished write has changed the save; report it even if Cancel was pressed late.
+                self.on_done(payload)
+            elif self.on_error:
+                self.on_error(TaskCancelled())
+            return
+        self._poll_id = self.widget.after(TASK_POLL_MS, self._poll)
+
+def check_cancelled(cancelled: threading.Event) -> None:
+    if cancelled.is_set():
+        raise TaskCancelled()
 
 def init_inventory_gui(parent):
     try:
@@ -84,10 +235,9 @@ def init_inventory_gui(parent):
     global POWER_BADGES
     if not POWER_BADGES:
         POWER_BADGES = {
-            lvl: ImageTk.PhotoImage(
-                Image.open(os.path.join(ASSETS_DIR, f"PowerLevel{lvl}.png"))
-                .resize((25, 25))
-            )
+            lvl: Image.open(os.path.join(ASSETS_DIR, f"PowerLevel{lvl}.png"))
+            .convert("RGBA")
+            .resize((25, 25))
             for lvl in range(1, 5)
         }
 
@@ -146,6 +296,10 @@ def init_inventory_gui(parent):
         lbl.grid(row=0, column=i, padx=10, pady=8)
         loadout_labels.append(lbl)
 
+    for lbl in list(slot_labels.values()) + loadout_labels:
+        lbl._wiki_name = None
+        lbl.bind("<Button-1>", open_wiki)
+
     parent._inventory_widgets = {
         "slot_labels": slot_labels,
         "loadout_labels": loadout_labels
@@ -159,272 +313,310 @@ def reset_inventory_tab(inv_frame: tk.Frame) -> None:
     loadout_labels = widgets.get("loadout_labels", [])
 
     for idx, lbl in slot_labels.items():
-        lbl.configure(image="", text=str(idx), width=8, height=4)
+        lbl.configure(image="", text=str(idx), width=8, height=4, highlightthickness=0)
         lbl.image = None
-        for binding in lbl.bind():
-            lbl.unbind(binding)
-        lbl._tooltip = None
-        _set_count_badge(lbl, None)
-        _set_power_badge(lbl, None)
-        if idx < 8:
-            lbl.grid(row=0, column=idx, padx=4, pady=4)
-        else:
-            tab_start = {"main": 8, "rune": 32, "quest": 56}
-            for tab, start in tab_start.items():
-                if start <= idx < start + 24:
-                    row = (idx - start) // 8
-                    col = (idx - start) % 8
-                    lbl.grid(row=row, column=col, padx=4, pady=4)
-                    break
+        lbl._wiki_name = None
+        set_tooltip(lbl, None)
 
     ph_imgs = getattr(inv_frame, "_icon_refs", {}).get("loadout", [])
     for idx, (lbl, ph) in enumerate(zip(loadout_labels, ph_imgs)):
-        lbl.configure(image=ph, width=62, height=62)
+        lbl.configure(image=ph, width=62, height=62, highlightthickness=0)
         lbl.image = ph
-        for binding in lbl.bind():
-            lbl.unbind(binding)
-        lbl._tooltip = None
-        _set_count_badge(lbl, None)
-        _set_power_badge(lbl, None)
-        lbl.grid(row=0, column=idx, padx=10, pady=8)
+        lbl._wiki_name = None
+        set_tooltip(lbl, None)
+
+    diff_summary.configure(text="")
+
+def open_wiki(event) -> None:
+    name = getattr(event.widget, "_wiki_name", None)
+    if name:
+        webbrowser.open(f"https://dragonwilds.runescape.wiki/w/{name}")
+
+def get_save_session(file_path: str) -> save_io.SaveSession:
+    global save_session
+    if save_session is None or save_session.path != file_path:
+        save_session = save_io.SaveSession(file_path)
+    return save_session
 
 def refresh_inventory_icons(file_path: str, inv_frame: tk.Frame) -> None:
     if not os.path.isfile(file_path):
         reset_inventory_tab(inv_frame)
         return
-    try:
-        with open(file_path, "r", encoding="utf-8") as fh:
-            save = json.load(fh)
-    except Exception as exc:
-        print("Save parse error:", exc)
-        reset_inventory_tab(inv_frame)
+    session = get_save_session(file_path)
+    if not session.is_stale():
+        render_inventory_icons(inv_frame, *session.tables())
         return
 
-    root_inv = save.get("Inventory", {})
-    inv_dict = root_inv.get("Inventory") or {k: v for k, v in root_inv.items() if k.isdigit()}
-    loadout_dict = (
-        save.get("Loadout") or
-        root_inv.get("Loadout") or
-        save.get("PersonalInventory", {}).get("Loadout", {}))
+    def work(progress, cancelled):
+        progress(0.3, "Reading inventory...")
+        return session.tables()
+
+    def failed(exc):
+        if not isinstance(exc, TaskCancelled):
+            print("Save parse error:", exc)
+        reset_inventory_tab(inv_frame)
 
+    if start_task(work, lambda tables: render_inventory_icons(inv_frame, *tables), on_error=failed) is None:
+        # Only a save write blocks a refresh, and the write refreshes the tab when it finishes.
+        print("Inventory refresh deferred until the save write finishes.")
+
+def render_inventory_icons(inv_frame: tk.Frame, inventory: SlotTable, loadout: SlotTable) -> None:
     widgets        = getattr(inv_frame, "_inventory_widgets", {})
     slot_labels    = widgets.get("slot_labels", {})
     loadout_labels = widgets.get("loadout_labels", [])
 
-    _, _, item_lookup, _ = load_item_list()
-
-    for idx, lbl in slot_labels.items():
-        lbl.configure(image="", text=str(idx), width=8, height=4)
-        lbl.image = None
-        for binding in lbl.bind():
-            lbl.unbind(binding)
-        lbl._tooltip = None
-        _set_count_badge(lbl, None)
-        _set_power_badge(lbl, None)
-        if idx < 8:
-            lbl.grid(row=0, column=idx, padx=4, pady=4)
-        else:
-            tab_start = {"main": 8, "rune": 32, "quest": 56}
-            for tab, start in tab_start.items():
-                if start <= idx < start + 24:
-                    row = (idx - start) // 8
-                    col = (idx - start) % 8
-                    lbl.grid(row=row, column=col, padx=4, pady=4)
-                    break
-
-    ph_imgs = getattr(inv_frame, "_icon_refs", {}).get("loadout", [])
-    for idx, (lbl, ph) in enumerate(zip(loadout_labels, ph_imgs)):
-        lbl.configure(image=ph, width=62, height=62)
-        lbl.image = ph
-        for binding in lbl.bind():
-            lbl.unbind(binding)
-        lbl._tooltip = None
-        _set_count_badge(lbl, None)
-        _set_power_badge(lbl, None)
-        lbl.grid(row=0, column=idx, padx=10, pady=8)
+    reset_inventory_tab(inv_frame)
 
     def get_item_name(item_id):
-        if not item_id:
-            return None
-        for item in item_lookup.values():
-            if item.get("PersistenceID") == item_id:
-                return item.get("SourceString")
-        return None
+        return item_by_pid.get(item_id, {}).get("SourceString") if item_id else None
 
     # Populate inventory slots
-    for idx_str, entry in inv_dict.items():
-        if not idx_str.isdigit():
-            continue
-        item_id = entry.get("ItemData")
-        icon_img = get_icon_image(item_id)
-        if not icon_img:
+    for idx, slot in inventory:
+        item_id = slot.item_id
+        tile = get_slot_tile(item_id, slot.count)
+        if not tile:
             continue
 
-        idx = int(idx_str)
         lbl = slot_labels.get(idx)
         if not lbl:
             continue
 
         lbl.configure(
-            image=icon_img,
+            image=tile,
             text="",
             width=SLOT_ICON_SIZE,
             height=SLOT_ICON_SIZE,
             compound="center"
         )
-        lbl.image = icon_img
-        _set_count_badge(lbl, entry.get("Count"))
-        _set_power_badge(lbl, item_id)
+        lbl.image = tile
 
         item_name = get_item_name(item_id)
         if item_name:
-            lbl._tooltip = ToolTip(lbl, item_name)
-            lbl.bind("<Button-1>", lambda e, name=item_name: webbrowser.open(f"https://dragonwilds.runescape.wiki/w/{name}"))
+            set_tooltip(lbl, item_name)
+            lbl._wiki_name = item_name
 
     missing_report = []
-    for idx_str, entry in loadout_dict.items():
-        if not idx_str.isdigit():
-            continue
-        idx = int(idx_str)
+    for idx, slot in loadout:
         if idx >= len(loadout_labels):
             continue
 
-        item_id = entry.get("ItemData")
-
-        if not item_id and "PlayerInventoryItemIndex" in entry:
-            ref = str(entry["PlayerInventoryItemIndex"])
-            item_id = inv_dict.get(ref, {}).get("ItemData")
+        item_id = slot.item_id
+        if not item_id and slot.inventory_index is not None:
+            item_id = inventory.item_at(int(slot.inventory_index))
 
-        icon_img = get_icon_image(item_id)
-        if not icon_img:
+        tile = get_slot_tile(item_id, slot.count)
+        if not tile:
             missing_report.append((idx, item_id))
             continue
 
         lbl = loadout_labels[idx]
-        lbl.configure(image=icon_img)
-        lbl.image = icon_img
-        _set_count_badge(lbl, entry.get("Count"))
-        _set_power_badge(lbl, item_id)
+        lbl.configure(image=tile)
+        lbl.image = tile
 
         item_name = get_item_name(item_id)
         if item_name:
-            lbl._tooltip = ToolTip(lbl, item_name)
-            lbl.bind("<Button-1>", lambda e, name=item_name: webbrowser.open(f"https://dragonwilds.runescape.wiki/w/{name}"))
+            set_tooltip(lbl, item_name)
+            lbl._wiki_name = item_name
 
     if missing_report:
         print("Load-out slots left on mask (no mapping):")
         for idx, iid in missing_report:
             print(f"  slot {idx}: ItemData {iid!r} not found in ItemID.txt or assets/UI/")
 
-def _set_count_badge(parent_lbl: tk.Label, count: int | None) -> None:
-    badge = getattr(parent_lbl, "_badge", None)
-    if badge is None:
-        badge = tk.Label(
-            parent_lbl,  text="", fg="white", bg="#444",
-            font=("Consolas", 10, "bold"), padx=2, pady=0
-        )
-        badge.place(relx=1.0, rely=1.0, anchor="se")
-        parent_lbl._badge = badge
+def highlight_slot_changes(inv_frame: tk.Frame, changes: list[dict]) -> None:
+    widgets = getattr(inv_frame, "_inventory_widgets", {})
+    slot_labels = widgets.get("slot_labels", {})
+    loadout_labels = widgets.get("loadout_labels", [])
 
-    if count is None:
-        badge.config(text="")
-        badge.place_forget()
-    else:
-        badge.config(text=str(count))
-        badge.place(relx=1.0, rely=1.0, anchor="se")
-
-def _set_power_badge(parent_lbl: tk.Label, item_id: str | None) -> None:
-    badge = getattr(parent_lbl, "_pwr_badge", None)
-    if badge is None:
-        badge = tk.Label(parent_lbl, image="", bd=0, bg=parent_lbl["bg"], highlightthickness=0)
-        badge.place(relx=0, rely=0, anchor="nw")
-        parent_lbl._pwr_badge = badge
-
-    lvl = POWER_MAP.get(item_id)
-    if lvl in POWER_BADGES:
-        badge.config(image=POWER_BADGES[lvl])
-        badge.image = POWER_BADGES[lvl]
-        badge.place(relx=0, rely=0, anchor="nw")
-    else:
-        badge.config(image="")
-        badge.place_forget()
+    for lbl in list(slot_labels.values()) + loadout_labels:
+        lbl.configure(highlightthickness=0)
+    for change in changes:
+        slot = change["slot"]
+        if change["section"] == "inventory":
+            lbl = slot_labels.get(slot)
+        else:
+            lbl = loadout_labels[slot] if 0 <= slot < len(loadout_labels) else None
+        if lbl is None:
+            continue
+        color = DIFF_COLORS[change["change"]]
+        lbl.configure(highlightthickness=2, highlightbackground=color, highlightcolor=color)
+
+def _get_badge_font() -> ImageFont.ImageFont:
+    global BADGE_FONT
+    if BADGE_FONT is None:
+        BADGE_FONT = inventory_render.load_badge_font()
+    return BADGE_FONT
+
+def get_slot_tile(item_id: str | None, count: int | None = None) -> ImageTk.PhotoImage | None:
+    if not item_id:
+        return None
+
+    power = POWER_MAP.get(item_id)
+    cache_key = (item_id, count, power)
+    tile = TILE_CACHE.get(cache_key)
+    if tile is not None:
+        TILE_CACHE.move_to_end(cache_key)
+        return tile
+
+    icon = SLOT_ICON_CACHE.get(item_id)
+    if icon is None:
+        icon = open_icon(item_id, SLOT_ICON_SIZE)
+        if icon is None:
+            return None
+        SLOT_ICON_CACHE[item_id] = icon
+
+    img = inventory_render.compose_tile(icon, POWER_BADGES.get(power), count, _get_badge_font(), SLOT_ICON_SIZE)
+    tile = ImageTk.PhotoImage(img)
+    TILE_CACHE[cache_key] = tile
+    if len(TILE_CACHE) > TILE_CACHE_MAX:
+        TILE_CACHE.popitem(last=False)
+    return tile
+
+def preload_item_icons(pid: str, icon: str) -> None:
+    for size in (ITEM_ICON_SIZE, SELECTED_ICON_SIZE):
+        cache_key = (pid, size)
+        if cache_key not in ICON_CACHE:
+            try:
+                p = os.path.join(UI_DIR, icon)
+                if not os.path.exists(p):
+                    print(f"Icon file missing: {p} for ItemID {pid}")
+                    continue
+                img = Image.open(p).convert("RGBA").resize(
+                    (size, size),
+                    Image.LANCZOS
+                )
+                tk_img = ImageTk.PhotoImage(img)
+                ICON_CACHE[cache_key] = tk_img
+            except Exception as e:
+                print(f"Failed to preload icon {icon} for ItemID {pid}: {e}")
+
+def add_catalog_entry(entry, lookup, categorized_items) -> str | None:
+    name = sys.intern(entry.get("SourceString", "").strip())
+    if not name:
+        return None
+    original_category = sys.intern(entry.get("Category", "Miscellaneous"))
+    category = sys.intern(original_category.lower())
+    if category not in categorized_items:
+        categorized_items[category] = []
+    categorized_items[category].append((name, original_category))
+    lookup[name] = entry
+    pid = entry.get("PersistenceID")
+    pwr = entry.get("PowerLevel")
+    if pid and pwr is not None:
+        POWER_MAP[pid] = pwr
+    return category
+
+def remove_catalog_entry(entry, lookup, categorized_items) -> str | None:
+    name = entry.get("SourceString", "").strip()
+    if not name:
+        return None
+    original_category = entry.get("Category", "Miscellaneous")
+    category = original_category.lower()
+    if lookup.get(name) is entry:
+        del lookup[name]
+    bucket = categorized_items.get(category, [])
+    if (name, original_category) in bucket:
+        bucket.remove((name, original_category))
+    if not bucket:
+        categorized_items.pop(category, None)
+    return category
 
 def load_item_list():
     global ICON_MAP, POWER_MAP
-    items, display_map, lookup, categorized_items = [], {}, {}, {}
-    path = os.path.join(DATA_DIR, "ItemID.txt")
+    lookup, categorized_items = {}, {}
+    path = CATALOG_FILE
     if not os.path.exists(path):
         messagebox.showerror("Missing File", f"ItemID.txt not found in {DATA_DIR}.")
-        return items, display_map, lookup, categorized_items
+        return lookup, categorized_items, {}
 
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            try:
-                data = json.load(f)
-            except json.JSONDecodeError:
-                txt = f.read() if f.closed else f""
-                if not txt:
-                    txt = open(path, "r", encoding="utf-8").read()
-                txt = txt.strip()
-                if not txt.startswith('['):
-                    txt = '[' + txt.rstrip(',\n') + ']'
-                data = json.loads(txt)
+        data = catalog.read_item_entries(path)
     except Exception as e:
         messagebox.showerror("Parse Error", f"Cannot read ItemID.txt: {e}")
-        return items, display_map, lookup, categorized_items
+        return lookup, categorized_items, {}
 
     for entry in data:
         pid = entry.get("PersistenceID")
         icon = entry.get("IconFile")
         if pid and icon:
             ICON_MAP[pid] = icon
-            for size in (ITEM_ICON_SIZE, SELECTED_ICON_SIZE):
-                cache_key = (pid, size)
-                if cache_key not in ICON_CACHE:
-                    try:
-                        p = os.path.join(UI_DIR, icon)
-                        if not os.path.exists(p):
-                            print(f"Icon file missing: {p} for ItemID {pid}")
-                            continue
-                        img = Image.open(p).convert("RGBA").resize(
-                            (size, size),
-                            Image.LANCZOS
-                        )
-                        tk_img = ImageTk.PhotoImage(img)
-                        ICON_CACHE[cache_key] = tk_img
-                    except Exception as e:
-                        print(f"Failed to preload icon {icon} for ItemID {pid}: {e}")
+            preload_item_icons(pid, icon)
 
     for entry in data:
-        name = entry.get("SourceString", "").strip()
-        if not name:
-            continue
-        category = entry.get("Category", "Miscellaneous")
-        original_category = category
-        category = category.lower()
-        if category not in categorized_items:
-            categorized_items[category] = []
-        categorized_items[category].append((name, original_category))
-        items.append(name)
-        display_map[name] = name
-        lookup[name] = entry
-        pid = entry.get("PersistenceID")
-        pwr = entry.get("PowerLevel")
-        if pid and pwr is not None:
-            POWER_MAP[pid] = pwr
+        add_catalog_entry(entry, lookup, categorized_items)
 
     print(f"Loaded {len(categorized_items)} categories: {sorted(categorized_items.keys())}")
 
-    return items, display_map, lookup, categorized_items
+    return lookup, categorized_items, catalog.index_by_persistence_id(data)
 
-def get_icon_image(item_id: str) -> ImageTk.PhotoImage | None:
-    if not item_id:
-        return None
+def forget_item_icons(pid: str) -> None:
+    for size in (ITEM_ICON_SIZE, SELECTED_ICON_SIZE):
+        ICON_CACHE.pop((pid, size), None)
+    SLOT_ICON_CACHE.pop(pid, None)
+    for cache_key in [key for key in TILE_CACHE if key[0] == pid]:
+        del TILE_CACHE[cache_key]
 
-    cache_key = (item_id, SLOT_ICON_SIZE)
-    if cache_key in ICON_CACHE:
-        return ICON_CACHE[cache_key]
+def reload_catalog() -> None:
+    global catalog_mtime
+    try:
+        mtime = os.stat(CATALOG_FILE).st_mtime_ns
+    except OSError:
+        return
+    if mtime == catalog_mtime:
+        return
+    catalog_mtime = mtime
+    try:
+        entries = catalog.read_item_entries(CATALOG_FILE)
+    except (OSError, ValueError) as e:
+        print(f"Catalog reload skipped, cannot read ItemID.txt: {e}")
+        return
+
+    new_by_pid = catalog.index_by_persistence_id(entries)
+    added, removed, changed = catalog.diff_entries(item_by_pid, new_by_pid)
+    if not (added or removed or changed):
+        return
 
+    started = time.perf_counter()
+    touched = set()
+    registry = (item_lookup, categorized_items)
+    orphaned = set()
+    for pid in removed + changed:
+        entry = item_by_pid.pop(pid)
+        touched.add(remove_catalog_entry(entry, *registry))
+        orphaned.add(entry.get("SourceString", "").strip())
+        ICON_MAP.pop(pid, None)
+        POWER_MAP.pop(pid, None)
+        forget_item_icons(pid)
+    for pid in added + changed:
+        entry = new_by_pid[pid]
+        item_by_pid[pid] = entry
+        if entry.get("IconFile"):
+            ICON_MAP[pid] = entry["IconFile"]
+            preload_item_icons(pid, entry["IconFile"])
+        touched.add(add_catalog_entry(entry, *registry))
+    orphaned.difference_update(item_lookup)
+    orphaned.discard("")
+    if orphaned:
+        # Another entry may share a removed entry's name; point the name lookup at it.
+        for entry in item_by_pid.values():
+            name = entry.get("SourceString", "").strip()
+            if name in orphaned:
+                item_lookup[name] = entry
+    touched.discard(None)
+
+    refresh_item_box(touched)
+    update_max_stack_display()
+    if save_session is not None:
+        refresh_inventory_icons(save_session.path, inventory_tab)
+    print(f"Catalog reloaded: {len(added)} added, {len(removed)} removed, {len(changed)} changed "
+          f"in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+def watch_catalog() -> None:
+    global catalog_watch_job
+    reload_catalog()
+    catalog_watch_job = root.after(CATALOG_POLL_MS, watch_catalog)
+
+def open_icon(item_id: str, size: int) -> Image.Image | None:
     icon_name = ICON_MAP.get(item_id)
     if not icon_name:
         return None
@@ -434,13 +626,10 @@ def get_icon_image(item_id: str) -> ImageTk.PhotoImage | None:
         if not os.path.exists(p):
             print(f"Icon file missing: {p} for ItemID {item_id}")
             return None
-        img = Image.open(p).convert("RGBA").resize(
-            (SLOT_ICON_SIZE, SLOT_ICON_SIZE),
+        return Image.open(p).convert("RGBA").resize(
+            (size, size),
             Image.LANCZOS
         )
-        tk_img = ImageTk.PhotoImage(img)
-        ICON_CACHE[cache_key] = tk_img
-        return tk_img
     except Exception as e:
         print(f"Failed to load icon {icon_name} for ItemID {item_id}: {e}")
         return None
@@ -479,12 +668,6 @@ def inject_items():
     if not os.path.isfile(file_path):
         messagebox.showerror("Error", "File not found!")
         return
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            save_data = json.load(f)
-    except json.JSONDecodeError:
-        messagebox.showerror("Error", "Invalid JSON format in save file.")
-        return
 
     if not injection_queue:
         selected = selected_item.get().strip()
@@ -506,62 +689,48 @@ def inject_items():
             messagebox.showerror("Error", "Inputs must be valid numbers!")
             return
 
-        temp_entry = {
-            "item_name": selected,
-            "persistence_id": item_data["PersistenceID"],
-            "count": count,
-            "start_slot": start_slot,
-            "end_slot": end_slot,
-            "durability": durability,
-            "vitalshield": item_data.get("VitalShield")
-        }
-        temp_queue = [temp_entry]
+        temp_queue = [make_queue_entry(selected, item_data, count, start_slot, end_slot, durability)]
     else:
-        temp_queue = injection_queue
-
-    backup_path = file_path.replace(".json", "_backup.json")
-    if not os.path.exists(backup_path):
-        with open(backup_path, 'w', encoding='utf-8') as backup:
-            json.dump(save_data, backup, indent=4)
-
-    inventory = save_data.get("Inventory", {})
-    new_items = {}
-    for entry in sorted(temp_queue, key=lambda e: e["start_slot"]):
-        for slot in range(entry["start_slot"], entry["end_slot"] + 1):
-            guid = generate_guid()
-            item_entry = {
-                "GUID": guid,
-                "ItemData": entry["persistence_id"]
-            }
-            if entry["count"]:
-                item_entry["Count"] = entry["count"]
-            if entry["durability"]:
-                item_entry["Durability"] = entry["durability"]
-            if entry["vitalshield"] is not None:
-                item_entry["VitalShield"] = entry["vitalshield"]
-            new_items[str(slot)] = item_entry
-
-    merged_inventory = OrderedDict()
-    all_keys = list(inventory.keys()) + list(new_items.keys())
-    numeric_keys = sorted({int(k) for k in all_keys if k.isdigit()})
-    for k in numeric_keys:
-        k_str = str(k)
-        if k_str in new_items:
-            merged_inventory[k_str] = new_items[k_str]
-        elif k_str in inventory:
-            merged_inventory[k_str] = inventory[k_str]
-    max_existing = max([int(k) for k in merged_inventory.keys() if k.isdigit()], default=0)
-    merged_inventory["MaxSlotIndex"] = max(inventory.get("MaxSlotIndex", 0), max_existing)
-    save_data["Inventory"] = merged_inventory
-
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(save_data, f, indent=4)
-
-    messagebox.showinfo("Success", f"Injected {len(new_items)} items.")
-    if injection_queue:
-        injection_queue.clear()
-        update_queue_display()
-    refresh_inventory_icons(file_path, inventory_tab)
+        temp_queue = list(injection_queue)
+    from_queue = bool(injection_queue)
+    session = get_save_session(file_path)
+
+    def work(progress, cancelled):
+        progress(0.1, "Reading save...")
+        inventory = session.load()
+        check_cancelled(cancelled)
+
+        progress(0.3, "Writing backup...")
+        backup_path = save_io.backup_path_for(file_path)
+        if not os.path.exists(backup_path):
+            shutil.copyfile(file_path, backup_path)
+        check_cancelled(cancelled)
+
+        progress(0.5, "Merging items...")
+        registry = GuidRegistry.for_save(file_path)
+        merged_inventory, injected = build_merged_inventory(inventory, temp_queue, registry)
+        check_cancelled(cancelled)
+
+        progress(0.7, "Writing save...", cancellable=False)
+        session.write_inventory(merged_inventory)
+        return injected
+
+    def done(injected):
+        messagebox.showinfo("Success", f"Injected {injected} items.")
+        if from_queue:
+            injection_queue.clear()
+            update_queue_display()
+        refresh_inventory_icons(file_path, inventory_tab)
+
+    def failed(exc):
+        if isinstance(exc, TaskCancelled):
+            return
+        if isinstance(exc, json.JSONDecodeError):
+            messagebox.showerror("Error", "Invalid JSON format in save file.")
+        else:
+            messagebox.showerror("Error", f"Injection failed: {exc}")
+
+    start_task(work, done, on_error=failed, writes=True)
 
 def add_to_queue():
     selected = selected_item.get().strip()
@@ -577,40 +746,96 @@ def add_to_queue():
     except ValueError:
         messagebox.showerror("Error", "Inputs must be valid numbers!")
         return
-    entry = {
-        "item_name": selected,
-        "persistence_id": item_data["PersistenceID"],
-        "count": count,
-        "start_slot": start_slot,
-        "end_slot": end_slot,
-        "durability": durability,
-        "vitalshield": item_data.get("VitalShield")
-    }
-    injection_queue.append(entry)
+    injection_queue.append(make_queue_entry(selected, item_data, count, start_slot, end_slot, durability))
     update_queue_display()
 
 def update_queue_display():
-    queue_display.configure(state='normal')
-    queue_display.delete("1.0", tk.END)
-    lines = []
-    for i, entry in enumerate(injection_queue):
-        label = f"[{entry['start_slot']}]" if entry['start_slot'] == entry['end_slot'] else f"[{entry['start_slot']}-{entry['end_slot']}]"
-        label += f" {entry['item_name']}"
-        if entry['count']:
-            label += f" ({entry['count']})"
-        lines.append(label)
-    output = ""
-    for i in range(0, len(lines), 2):
-        left = lines[i].ljust(35)
-        right = lines[i+1] if i+1 < len(lines) else ""
-        output += f"{left}{right}\n"
-    queue_display.insert(tk.END, output)
-    queue_display.configure(state='disabled')
+    queue_view.refresh()
 
 def clear_queue():
     injection_queue.clear()
     update_queue_display()
 
+def remove_queue_entry(event=None):
+    index = queue_view.selected_index()
+    if index is None:
+        return
+    injection_queue.remove(index)
+    update_queue_display()
+
+def edit_queue_entry(event=None):
+    index = queue_view.selected_index()
+    if index is None:
+        return
+    entry = injection_queue[index]
+
+    dialog = tk.Toplevel(root)
+    dialog.title(f"Edit {entry['item_name']}")
+    dialog.configure(bg="#1c1b18")
+    dialog.transient(root)
+
+    fields = {}
+    for row, (key, text) in enumerate((("start_slot", "Start Slot:"), ("end_slot", "End Slot:"),
+                                       ("count", "Item Count:"), ("durability", "Durability:"))):
+        ttk.Label(dialog, text=text).grid(row=row, column=0, sticky="e", padx=5, pady=5)
+        field = ttk.Entry(dialog, width=10)
+        field.insert(0, "" if entry[key] is None else str(entry[key]))
+        field.grid(row=row, column=1, padx=5, pady=5, sticky="w")
+        bind_scroll_increment(field)
+        fields[key] = field
+
+    def save():
+        try:
+            values = {key: int(field.get()) if field.get().strip() else None for key, field in fields.items()}
+        except ValueError:
+            messagebox.showerror("Error", "Inputs must be valid numbers!", parent=dialog)
+            return
+        if values["start_slot"] is None or values["end_slot"] is None:
+            messagebox.showerror("Error", "Start and End slots are required.", parent=dialog)
+            return
+        injection_queue.update(index, **values)
+        update_queue_display()
+        dialog.destroy()
+
+    ttk.Button(dialog, text="Save", command=save).grid(row=4, column=0, columnspan=2, pady=10)
+    dialog.wait_visibility()
+    dialog.grab_set()
+
+def resolve_queue_item(item_name, persistence_id):
+    item_data = item_by_pid.get(persistence_id)
+    if item_data is None:
+        item_data = item_lookup.get((item_name or "").strip())
+    if item_data is None:
+        return None
+    return item_data["SourceString"].strip(), item_data
+
+def load_queue_preset():
+    fp = filedialog.askopenfilename(title="Load Queue Preset", filetypes=[("Queue preset", "*.json *.csv")])
+    if not fp:
+        return
+    try:
+        skipped = injection_queue.load_preset(fp, resolve_queue_item)
+    except (OSError, ValueError) as exc:
+        messagebox.showerror("Error", f"Cannot read preset: {exc}")
+        return
+    queue_view.offset = 0
+    update_queue_display()
+    if skipped:
+        names = ", ".join(str(row.get("item_name") or row.get("persistence_id")) for row in skipped[:5])
+        messagebox.showwarning("Preset", f"Skipped {len(skipped)} entries with unknown items or slots: {names}")
+
+def save_queue_preset():
+    fp = filedialog.asksaveasfilename(
+        title="Save Queue Preset", defaultextension=".json",
+        filetypes=[("JSON preset", "*.json"), ("CSV preset", "*.csv")]
+    )
+    if not fp:
+        return
+    try:
+        injection_queue.save_preset(fp)
+    except OSError as exc:
+        messagebox.showerror("Error", f"Cannot write preset: {exc}")
+
 def update_max_stack_display(*args):
     selected = selected_item.get().strip()
     item = item_lookup.get(selected)
@@ -702,6 +927,12 @@ def create_item_box(parent, categorized_items, item_lookup):
     current_filtered_items = {}
     last_search_text = None
     search_debounce_id = None
+    render_slice_budget = 0.004
+    render_pending = {}
+    render_order = []
+    render_job = None
+    category_layout = {}
+    layout_order = []
 
     def initialize_widget_pools():
         canvas.update_idletasks()
@@ -714,25 +945,128 @@ def create_item_box(parent, categorized_items, item_lookup):
             if not items_frame:
                 continue
             for _ in range(max_widgets):
-                lbl = tk.Label(
-                    items_frame,
-                    bg="#1c1b18",
-                    bd=0,
-                    highlightthickness=0
-                )
-                widget_pools[category].append(lbl)
+                widget_pools[category].append(new_pool_label(items_frame))
+
+    def new_pool_label(items_frame):
+        lbl = tk.Label(
+            items_frame,
+            bg="#1c1b18",
+            bd=0,
+            highlightthickness=0
+        )
+        lbl.item_name = None
+        lbl._gridded = False
+        lbl.bind("<Button-1>", on_pool_click)
+        return lbl
+
+    def on_pool_click(event):
+        lbl = event.widget
+        if lbl.item_name:
+            select_item(lbl.item_name, lbl)
+
+    def filter_items(items, search_text):
+        if not search_text:
+            return items
+        return [(item, orig_cat) for item, orig_cat in items if search_text.lower() in item.lower()]
+
+    def create_category_frames(category, items, row):
+        cat_frame = tk.Frame(scrollable_frame, bg="#1c1b18")
+        cat_frame.grid(row=row, column=0, sticky="w", pady=2)
+        display_name = items[0][1] if items else category.capitalize()
+        toggle_btn = tk.Button(
+            cat_frame,
+            text=f"{display_name} ▼",
+            command=lambda c=category: toggle_category(c),
+            bg="#2c2b27",
+            fg="gold",
+            font=("Georgia", 10, "bold"),
+            relief="flat"
+        )
+        toggle_btn.grid(row=0, column=0, sticky="w")
+
+        items_frame = tk.Frame(scrollable_frame, bg="#1c1b18")
+        items_frame.grid(row=row + 1, column=0, sticky="w", pady=2)
+        category_frames[category] = {"frame": items_frame, "toggle_btn": toggle_btn, "display_name": display_name, "row": row}
+        category_layout[category] = {"header": max(20, toggle_btn.winfo_reqheight()), "body": 0, "y": 0, "position": 0}
+        item_positions[category] = {"items": items, "y_position": 0}
+        category_visible.setdefault(category, True)
+        initial_render_done.setdefault(category, False)
+        widget_pools.setdefault(category, [])
+
+    def refresh_categories(categories):
+        structural = False
+        for category in categories:
+            items = categorized_items.get(category, [])
+            filtered = filter_items(items, last_search_text)
+            if items and category not in category_frames:
+                create_category_frames(category, items, 0)
+                structural = True
+            elif bool(filtered) != (category in layout_order):
+                structural = True
+        if structural:
+            for row, category in enumerate(sorted(category_frames)):
+                category_frames[category]["row"] = row * 2
+            update_box(last_search_text or "")
+            return
+
+        for category in categories:
+            if category not in category_frames:
+                continue
+            items = filter_items(categorized_items.get(category, []), last_search_text)
+            current_filtered_items[category] = items
+            item_positions[category]["items"] = items
+            items_frame = category_frames[category]["frame"]
+            num_rows = (len(items) + items_per_row - 1) // items_per_row
+            for r in range(items_frame.grid_size()[1]):
+                items_frame.grid_rowconfigure(r, minsize=0)
+            for r in range(num_rows):
+                items_frame.grid_rowconfigure(r, minsize=ITEM_ICON_SIZE + 10)
+            layout = category_layout[category]
+            layout["body"] = (ITEM_ICON_SIZE + 10) * num_rows
+            if category_visible[category]:
+                scrollable_frame.grid_rowconfigure(category_frames[category]["row"] + 1, minsize=layout["body"])
+            for lbl in widget_pools.get(category, [])[:len(items)]:
+                lbl._rendered_item = None
+            shift_layout(layout["position"])
+            render_visible_items(category, force_render=True)
+        update_scrollregion()
+
+    def shift_layout(start):
+        y = 0
+        if start > 0:
+            prev = layout_order[start - 1]
+            layout = category_layout[prev]
+            y = layout["y"] + layout["header"] + (layout["body"] if category_visible[prev] else 0)
+        for category in layout_order[start:]:
+            layout = category_layout[category]
+            layout["y"] = y
+            item_positions[category]["y_position"] = y + layout["header"]
+            y += layout["header"] + (layout["body"] if category_visible[category] else 0)
 
     def toggle_category(category):
         category_visible[category] = not category_visible[category]
         items_frame = category_frames[category]["frame"]
+        items_row = category_frames[category]["row"] + 1
+        layout = category_layout[category]
         if category_visible[category]:
             category_frames[category]["toggle_btn"].config(text=f"{category_frames[category]['display_name']} ▼")
-            render_visible_items(category, force_render=True)
+            scrollable_frame.grid_rowconfigure(items_row, minsize=layout["body"])
+            items_frame.grid(row=items_row, column=0, sticky="w", pady=0)
         else:
             category_frames[category]["toggle_btn"].config(text=f"{category_frames[category]['display_name']} ►")
-            for lbl in widget_pools.get(category, []):
-                lbl.grid_remove()
-        update_box(search_entry.get())
+            scrollable_frame.grid_rowconfigure(items_row, minsize=0)
+            items_frame.grid_remove()
+
+        position = layout["position"]
+        if position >= len(layout_order) or layout_order[position] != category:
+            return
+        shift_layout(position)
+        top, bottom = get_visible_range()
+        for below in layout_order[position:]:
+            if category_layout[below]["y"] > bottom:
+                break
+            render_visible_items(below, force_render=below == category)
+        update_scrollregion()
 
     def select_item(item_name, label):
         nonlocal selected_label
@@ -765,13 +1099,80 @@ def create_item_box(parent, categorized_items, item_lookup):
         buffer = 200
         return top - buffer, bottom + buffer
 
+    def cancel_render():
+        nonlocal render_job
+        if render_job:
+            parent.after_cancel(render_job)
+            render_job = None
+        render_pending.clear()
+        render_order.clear()
+
+    def queue_render(category, indices):
+        nonlocal render_job
+        category_start_y = item_positions[category]["y_position"]
+        for idx in indices:
+            render_pending[(category, idx)] = category_start_y + (idx // items_per_row) * (ITEM_ICON_SIZE + 10)
+        render_order.clear()
+        if render_pending and not render_job:
+            render_job = parent.after(1, render_slice)
+
+    def render_slice():
+        nonlocal render_job
+        render_job = None
+        if not render_order:
+            top, bottom = get_visible_range()
+            render_order[:] = sorted(
+                render_pending,
+                key=lambda unit: (top <= render_pending[unit] <= bottom, -render_pending[unit])
+            )
+        deadline = time.perf_counter() + render_slice_budget
+        while render_order:
+            unit = render_order.pop()
+            render_pending.pop(unit, None)
+            render_item(*unit)
+            if time.perf_counter() >= deadline:
+                break
+        if render_pending:
+            render_job = parent.after(1, render_slice)
+
+    def render_item(category, idx):
+        if not category_visible[category]:
+            return
+        items = item_positions[category]["items"]
+        if idx >= len(items):
+            return
+        item = items[idx][0]
+        pool = widget_pools[category]
+        while idx >= len(pool):
+            pool.append(new_pool_label(category_frames[category]["frame"]))
+        lbl = pool[idx]
+        if getattr(lbl, "_rendered_item", None) == item:
+            return
+
+        item_id = item_lookup.get(item, {}).get("PersistenceID")
+        icon = get_box_icon_image(item_id, size=ITEM_ICON_SIZE) if item_id else PLACEHOLDER_ICON
+        lbl.configure(
+            image=icon,
+            text="",
+            compound="center",
+            fg="white",
+            font=("Georgia", 8),
+            bd=0,
+            highlightthickness=0
+        )
+        lbl.image = icon
+        lbl.item_name = item
+        lbl.grid(row=idx // items_per_row, column=idx % items_per_row, padx=5, pady=5)
+        lbl._gridded = True
+        set_tooltip(lbl, item)
+        lbl._rendered_item = item
+
     def render_visible_items(category, force_render=False):
         if not category_visible[category]:
             return
         if category not in item_positions:
             return
         items = item_positions[category]["items"]
-        items_frame = category_frames[category]["frame"]
         top, bottom = get_visible_range()
 
         num_items = len(items)
@@ -781,43 +1182,17 @@ def create_item_box(parent, categorized_items, item_lookup):
         category_end_y = category_start_y + category_height
 
         if force_render or not initial_render_done[category] or (category_end_y >= top and category_start_y <= bottom):
-            for lbl in widget_pools.get(category, []):
+            for lbl in widget_pools.get(category, [])[num_items:]:
+                # _rendered_item is also cleared to force a re-render, so it
+                # cannot tell whether the label is still on screen.
+                if not lbl._gridded:
+                    continue
                 lbl.grid_remove()
-                for binding in lbl.bind():
-                    lbl.unbind(binding)
-                lbl._tooltip = None
-
-            widget_index = 0
-            for idx, (item, y_position, original_category) in enumerate(items):
-                item_id = item_lookup.get(item, {}).get("PersistenceID")
-                icon = get_box_icon_image(item_id, size=ITEM_ICON_SIZE) if item_id else PLACEHOLDER_ICON
-
-                if widget_index >= len(widget_pools[category]):
-                    lbl = tk.Label(
-                        items_frame,
-                        bg="#1c1b18",
-                        bd=0,
-                        highlightthickness=0
-                    )
-                    widget_pools[category].append(lbl)
-                else:
-                    lbl = widget_pools[category][widget_index]
-
-                lbl.configure(
-                    image=icon,
-                    text="",
-                    compound="center",
-                    fg="white",
-                    font=("Georgia", 8)
-                )
-                lbl.image = icon
-                lbl.item_name = item
-                col = idx % items_per_row
-                row = idx // items_per_row
-                lbl.grid(row=row, column=col, padx=5, pady=5)
-                ToolTip(lbl, item)
-                lbl.bind("<Button-1>", lambda e, i=item, l=lbl: select_item(i, l))
-                widget_index += 1
+                lbl._gridded = False
+                lbl.item_name = None
+                set_tooltip(lbl, None)
+                lbl._rendered_item = None
+            queue_render(category, range(num_items))
 
         initial_render_done[category] = True
 
@@ -828,7 +1203,7 @@ def create_item_box(parent, categorized_items, item_lookup):
         if search_text:
             new_filtered_items = {}
             for category, items in categorized_items.items():
-                filtered = [(item, orig_cat) for item, orig_cat in items if search_text.lower() in item.lower()]
+                filtered = filter_items(items, search_text)
                 if filtered:
                     new_filtered_items[category] = filtered
         else:
@@ -837,6 +1212,9 @@ def create_item_box(parent, categorized_items, item_lookup):
         last_search_text = search_text
         current_filtered_items = new_filtered_items
 
+        cancel_render()
+        if selected_label is not None:
+            selected_label._rendered_item = None
         selected_label = None
         selected_item.set("")
 
@@ -848,64 +1226,44 @@ def create_item_box(parent, categorized_items, item_lookup):
             for category, items in sorted(current_filtered_items.items()):
                 if not items:
                     continue
-                cat_frame = tk.Frame(scrollable_frame, bg="#1c1b18")
-                cat_frame.grid(row=row, column=0, sticky="w", pady=2)
-                display_name = items[0][1] if items else category.capitalize()
-                toggle_btn = tk.Button(
-                    cat_frame,
-                    text=f"{display_name} ▼",
-                    command=lambda c=category: toggle_category(c),
-                    bg="#2c2b27",
-                    fg="gold",
-                    font=("Georgia", 10, "bold"),
-                    relief="flat"
-                )
-                toggle_btn.grid(row=0, column=0, sticky="w")
-                row += 1
-
-                items_frame = tk.Frame(scrollable_frame, bg="#1c1b18")
-                items_frame.grid(row=row, column=0, sticky="w", pady=2)
-                category_frames[category] = {"frame": items_frame, "toggle_btn": toggle_btn, "display_name": display_name}
-
-                y_position = row * (ITEM_ICON_SIZE + 10)
-                item_positions[category] = {"items": [(item, y_position, orig_cat) for item, orig_cat in items], "y_position": y_position}
-                num_rows = (len(items) + items_per_row - 1) // items_per_row
-                for r in range(num_rows):
-                    items_frame.grid_rowconfigure(r, minsize=ITEM_ICON_SIZE + 10)
-                row += num_rows
+                create_category_frames(category, items, row)
+                row += 2
 
             initialize_widget_pools()
 
-        row = 0
-        for r in range(scrollable_frame.grid_size()[1]):
-            scrollable_frame.grid_rowconfigure(r, minsize=0)
-        for category in sorted(categorized_items.keys()):
-            if category not in category_frames:
-                continue
+        layout_order.clear()
+        for category in sorted(category_frames.keys()):
+            header_row = category_frames[category]["row"]
             cat_frame = category_frames[category]["toggle_btn"].master
             items_frame = category_frames[category]["frame"]
             if category not in current_filtered_items:
+                scrollable_frame.grid_rowconfigure(header_row, minsize=0)
+                scrollable_frame.grid_rowconfigure(header_row + 1, minsize=0)
                 cat_frame.grid_remove()
                 items_frame.grid_remove()
                 continue
-            scrollable_frame.grid_rowconfigure(row, minsize=20)
-            cat_frame.grid(row=row, column=0, sticky="w", pady=0)
-            row += 1
+            scrollable_frame.grid_rowconfigure(header_row, minsize=20)
+            cat_frame.grid(row=header_row, column=0, sticky="w", pady=0)
             items = current_filtered_items[category]
             num_rows = (len(items) + items_per_row - 1) // items_per_row
             for r in range(items_frame.grid_size()[1]):
                 items_frame.grid_rowconfigure(r, minsize=0)
             for r in range(num_rows):
                 items_frame.grid_rowconfigure(r, minsize=ITEM_ICON_SIZE + 10)
+            layout = category_layout[category]
+            layout["body"] = (ITEM_ICON_SIZE + 10) * num_rows
+            layout["position"] = len(layout_order)
+            layout_order.append(category)
             if category_visible[category]:
-                scrollable_frame.grid_rowconfigure(row, minsize=(ITEM_ICON_SIZE + 10) * num_rows)
-                items_frame.grid(row=row, column=0, sticky="w", pady=0)
+                scrollable_frame.grid_rowconfigure(header_row + 1, minsize=layout["body"])
+                items_frame.grid(row=header_row + 1, column=0, sticky="w", pady=0)
             else:
-                scrollable_frame.grid_rowconfigure(row, minsize=0)
+                scrollable_frame.grid_rowconfigure(header_row + 1, minsize=0)
                 items_frame.grid_remove()
-            y_position = row * (ITEM_ICON_SIZE + 10)
-            item_positions[category] = {"items": [(item, y_position, orig_cat) for item, orig_cat in items], "y_position": y_position}
-            row += 1 if category_visible[category] else 0
+            item_positions[category] = {"items": items, "y_position": 0}
+
+        shift_layout(0)
+        for category in layout_order:
             if category_visible[category]:
                 render_visible_items(category)
 
@@ -927,6 +1285,7 @@ def create_item_box(parent, categorized_items, item_lookup):
         nonlocal search_debounce_id
         if search_debounce_id:
             parent.after_cancel(search_debounce_id)
+        cancel_render()
         search_debounce_id = parent.after(300, lambda: update_box(search_entry.get()))
 
     canvas.bind("<Motion>", on_scroll)
@@ -936,7 +1295,79 @@ def create_item_box(parent, categorized_items, item_lookup):
 
     update_box()
 
-    return update_box, debounce_search
+    return update_box, debounce_search, refresh_categories
+
+def set_write_in_flight(busy: bool) -> None:
+    state = "disabled" if busy else "normal"
+    for widget in (browse_button, add_queue_button, inject_button, clear_button, entry_file,
+                   edit_queue_button, remove_queue_button, load_preset_button):
+        widget.configure(state=state)
+
+def show_task_progress(fraction: float, message: str = "", cancellable: bool = True) -> None:
+    task_progress.configure(value=fraction)
+    task_status.configure(text=message)
+    cancel_task_button.configure(state="normal" if cancellable else "disabled")
+    task_progress.grid()
+    task_status.grid()
+    cancel_task_button.grid()
+
+def hide_task_progress() -> None:
+    task_progress.grid_remove()
+    task_status.grid_remove()
+    cancel_task_button.grid_remove()
+
+def cancel_active_task() -> None:
+    if active_tasks:
+        for task in active_tasks.values():
+            task.cancel()
+        task_status.configure(text="Cancelling...")
+
+def start_task(work, on_done, on_error=None, writes=False, slot="refresh") -> BackgroundTask | None:
+    # One task per slot: a new refresh replaces a running refresh but leaves a
+    # compare alone. A write owns the save, so it cancels every reader and
+    # nothing else starts until it finishes.
+    global progress_task
+    if "write" in active_tasks:
+        return None
+    if writes:
+        slot = "write"
+        for running in active_tasks.values():
+            running.cancel()
+    elif slot in active_tasks:
+        active_tasks[slot].cancel()
+
+    def finish(callback, payload):
+        global progress_task
+        if active_tasks.get(slot) is not task:
+            return
+        del active_tasks[slot]
+        if progress_task is task:
+            progress_task = next(iter(active_tasks.values()), None)
+            if progress_task is None:
+                hide_task_progress()
+            else:
+                show_task_progress(0.0, "Working...")
+        if writes:
+            set_write_in_flight(False)
+        if callback:
+            callback(payload)
+
+    def progress(fraction, message, cancellable=True):
+        if progress_task is task:
+            show_task_progress(fraction, message, cancellable)
+
+    if writes:
+        set_write_in_flight(True)
+    show_task_progress(0.0, "Working...")
+    task = BackgroundTask(
+        root, work,
+        on_done=lambda result: finish(on_done, result),
+        on_error=lambda exc: finish(on_error, exc),
+        on_progress=progress,
+        writes=writes
+    )
+    active_tasks[slot] = progress_task = task
+    return task
 
 root = tk.Tk()
 root.title("RuneScape Save Editor")
@@ -962,6 +1393,8 @@ style.theme_use('clam')
 style.configure("TLabel", background="#1c1b18", foreground="gold", font=("Georgia", 10, "bold"))
 style.configure("TEntry", fieldbackground="#302f2c", foreground="white")
 style.configure("TButton", background="#2c2b27", foreground="gold", font=("Georgia", 10, "bold"))
+style.configure("Treeview", background="#1c1b18", fieldbackground="#1c1b18", foreground="white", font=("Consolas", 10))
+style.configure("Treeview.Heading", background="#2c2b27", foreground="gold", font=("Georgia", 9, "bold"))
 
 notebook = ttk.Notebook(root)
 editor_tab = tk.Frame(notebook, bg="#1c1b18")
@@ -976,6 +1409,28 @@ notebook.add(editor_tab, text="Editor")
 notebook.add(inventory_tab, text="Inventory")
 notebook.pack(expand=True, fill='both')
 
+def compare_with_backup():
+    file_path = entry_file.get()
+    backups = save_diff.find_backups(file_path) if os.path.isfile(file_path) else []
+    if not backups:
+        messagebox.showinfo("Compare", "No backup found for this save.")
+        return
+
+    def work(progress, cancelled):
+        progress(0.3, "Comparing with backup...")
+        return save_diff.diff_saves(backups[0], file_path)
+
+    def done(report):
+        highlight_slot_changes(inventory_tab, report["changes"])
+        diff_summary.configure(text=f"{len(report['changes'])} slot changes since {os.path.basename(backups[0])}")
+
+    def failed(exc):
+        if not isinstance(exc, TaskCancelled):
+            messagebox.showerror("Error", f"Compare failed: {exc}")
+
+    if start_task(work, done, on_error=failed, slot="compare") is None:
+        messagebox.showinfo("Compare", "The save is still being written. Compare again once it finishes.")
+
 def load_json():
     entry_file.delete(0, tk.END)
     reset_inventory_tab(inventory_tab)
@@ -989,8 +1444,14 @@ def load_json():
     refresh_inventory_icons(fp, inventory_tab)
 
 init_inventory_gui(inventory_tab)
-
-item_list, display_lookup, item_lookup, categorized_items = load_item_list()
+diff_bar = tk.Frame(inventory_tab, bg="#1c1b18")
+diff_bar.pack(pady=(0, 10))
+ttk.Button(diff_bar, text="Compare with Backup", command=compare_with_backup).pack(side=tk.LEFT, padx=5)
+diff_summary = ttk.Label(diff_bar, text="")
+diff_summary.pack(side=tk.LEFT, padx=5)
+
+item_lookup, categorized_items, item_by_pid = load_item_list()
+catalog_mtime = os.stat(CATALOG_FILE).st_mtime_ns if os.path.exists(CATALOG_FILE) else None
 selected_item = tk.StringVar()
 selected_item.set("")
 selected_item.trace_add("write", update_max_stack_display)
@@ -999,7 +1460,8 @@ label_file = ttk.Label(editor_tab, text="Save File:")
 label_file.grid(row=0, column=0, sticky="e")
 entry_file = ttk.Entry(editor_tab, width=60)
 entry_file.grid(row=0, column=1, padx=5, pady=5)
-ttk.Button(editor_tab, text="Browse", command=load_json).grid(row=0, column=2, padx=5, pady=5)
+browse_button = ttk.Button(editor_tab, text="Browse", command=load_json)
+browse_button.grid(row=0, column=2, padx=5, pady=5)
 
 label_item = ttk.Label(editor_tab, text="Search Items:")
 label_item.grid(row=1, column=0, sticky="e")
@@ -1009,7 +1471,7 @@ clear_search_btn = tk.Label(editor_tab, text="✖", fg="red", bg="#302f2c", font
 clear_search_btn.grid(row=1, column=2, padx=(2, 0), sticky="w")
 clear_search_btn.bind("<Button-1>", lambda e: search_entry.delete(0, tk.END))
 
-update_box_func, debounce_search = create_item_box(editor_tab, categorized_items, item_lookup)
+update_box_func, debounce_search, refresh_item_box = create_item_box(editor_tab, categorized_items, item_lookup)
 update_box_func()
 search_entry.bind("<KeyRelease>", debounce_search)
 clear_search_btn.bind("<Button-1>", lambda e: [search_entry.delete(0, tk.END), update_box_func("")])
@@ -1053,14 +1515,36 @@ try:
 except Exception as e:
     print("Icon loading failed:", e)
 
-ttk.Button(editor_tab, text="Add to Queue", command=add_to_queue).grid(row=12, column=0, padx=(50, 5), pady=15, sticky="e")
-ttk.Button(editor_tab, text="Inject Items", command=inject_items).grid(row=12, column=1, padx=(5, 0), pady=15, sticky="w")
-
-queue_display = tk.Text(editor_tab, height=5, width=65, font=("Consolas", 10), background="#1c1b18", foreground="white", relief="flat", bd=0)
-queue_display.grid(row=13, column=0, columnspan=2, padx=10, pady=(0, 10), sticky="w")
+add_queue_button = ttk.Button(editor_tab, text="Add to Queue", command=add_to_queue)
+add_queue_button.grid(row=12, column=0, padx=(50, 5), pady=15, sticky="e")
+inject_button = ttk.Button(editor_tab, text="Inject Items", command=inject_items)
+inject_button.grid(row=12, column=1, padx=(5, 0), pady=15, sticky="w")
+
+queue_view = QueueView(editor_tab, injection_queue)
+queue_view.frame.grid(row=13, column=0, columnspan=2, padx=10, pady=(0, 10), sticky="w")
+queue_view.tree.bind("<Double-1>", edit_queue_entry)
+queue_view.tree.bind("<Delete>", remove_queue_entry)
+queue_buttons = tk.Frame(queue_view.frame, bg="#1c1b18")
+queue_buttons.grid(row=1, column=0, columnspan=2, sticky="w", pady=(4, 0))
+edit_queue_button = ttk.Button(queue_buttons, text="Edit", command=edit_queue_entry)
+edit_queue_button.pack(side=tk.LEFT, padx=(0, 5))
+remove_queue_button = ttk.Button(queue_buttons, text="Remove", command=remove_queue_entry)
+remove_queue_button.pack(side=tk.LEFT, padx=5)
+load_preset_button = ttk.Button(queue_buttons, text="Load Preset", command=load_queue_preset)
+load_preset_button.pack(side=tk.LEFT, padx=5)
+save_preset_button = ttk.Button(queue_buttons, text="Save Preset", command=save_queue_preset)
+save_preset_button.pack(side=tk.LEFT, padx=5)
 clear_button = tk.Button(editor_tab, text="✖", command=clear_queue, font=("Arial", 10), fg="red", bg="#1c1b18", relief="flat", bd=0)
 clear_button.grid(row=13, column=2, sticky="ne", padx=(0, 15), pady=(0, 10))
 
+task_progress = ttk.Progressbar(editor_tab, length=300, mode="determinate", maximum=1.0)
+task_progress.grid(row=14, column=1, padx=5, pady=(0, 10), sticky="w")
+task_status = ttk.Label(editor_tab, text="")
+task_status.grid(row=14, column=0, sticky="e")
+cancel_task_button = ttk.Button(editor_tab, text="Cancel", command=cancel_active_task)
+cancel_task_button.grid(row=14, column=2, padx=5, pady=(0, 10))
+hide_task_progress()
+
 ToolTip(label_file, "Browse to your RuneScape save file.")
 ToolTip(label_item, "Search for items to inject into the inventory.")
 ToolTip(label_count, "How many of the item to inject.")
@@ -1082,5 +1566,16 @@ bind_scroll_increment(entry_count)
 bind_scroll_increment(entry_durability)
 bind_scroll_increment(entry_start)
 bind_scroll_increment(entry_end)
+catalog_watch_job = root.after(CATALOG_POLL_MS, watch_catalog)
+
+if __name__ == "__main__":
+    stall_monitor = None
+    if os.environ.get("RSD_STALL_MONITOR"):
+        stall_monitor = StallMonitor(root, threshold_ms=float(os.environ.get("RSD_STALL_THRESHOLD_MS", 200)))
+        stall_monitor.start()
+
+    root.mainloop()
 
-root.mainloop()
\ No newline at end of file
+    if stall_monitor:
+        stall_monitor.stop()
+        stall_monitor.export(os.environ.get("RSD_STALL_REPORT", "stall_report.json"))
\ No newline at end of file
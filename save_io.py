@@ -0,0 +1,201 @@
+import codecs
+import contextlib
+import json
+import mmap
+import os
+import re
+import threading
+
+from slot_model import SlotTable
+
+_STRING_RE = re.compile(rb'"[^"]*"')
+_NON_STRUCTURAL = bytes(c for c in range(256) if c not in b'{}[]"')
+_DECODE_CHUNK = 1 << 16
+_decoder = json.JSONDecoder()
+
+def _skip_ws(buf, pos: int) -> int:
+    end = len(buf)
+    while pos < end and buf[pos:pos + 1] in (b" ", b"\t", b"\r", b"\n"):
+        pos += 1
+    return pos
+
+def _depth_change(segment: bytes) -> int | None:
+    # Reduce the segment to quotes and brackets at C speed, then drop strings
+    # so brackets inside string values do not count towards the depth.
+    reduced = (segment.replace(b"\\\\", b"").replace(b'\\"', b"")
+               .translate(None, _NON_STRUCTURAL).replace(b'""', b""))
+    if reduced.count(b'"') % 2:
+        return None
+    stripped = _STRING_RE.sub(b"", reduced)
+    return (stripped.count(b"{") + stripped.count(b"[")
+            - stripped.count(b"}") - stripped.count(b"]"))
+
+def find_top_level_keys(buf, keys) -> dict[str, int]:
+    # One forward pass for all keys: the depth is carried from candidate to
+    # candidate, so each byte before the last key is reduced only once.
+    needles = {json.dumps(key).encode("utf-8"): key for key in keys}
+    pattern = re.compile(b"(" + b"|".join(re.escape(n) for n in needles) + rb")[ \t\r\n]*:")
+    starts = {}
+    depth, scanned = 0, 0
+    for match in pattern.finditer(buf):
+        change = _depth_change(buf[scanned:match.start()])
+        if change is None:
+            continue
+        depth += change
+        scanned = match.start()
+        key = needles[match.group(1)]
+        if depth == 1 and key not in starts:
+            starts[key] = _skip_ws(buf, match.end())
+            if len(starts) == len(needles):
+                break
+    return starts
+
+def _decode_value(buf, start: int) -> tuple[object, int]:
+    size = _DECODE_CHUNK
+    while True:
+        chunk = buf[start:start + size]
+        text = codecs.getincrementaldecoder("utf-8")().decode(chunk, final=False)
+        try:
+            value, idx = _decoder.raw_decode(text)
+        except json.JSONDecodeError:
+            if start + size >= len(buf):
+                raise
+            size *= 4
+            continue
+        return value, start + len(text[:idx].encode("utf-8"))
+
+def find_section(buf, key: str) -> tuple[int, int, object] | None:
+    start = find_top_level_keys(buf, (key,)).get(key)
+    if start is None:
+        return None
+    value, end = _decode_value(buf, start)
+    return start, end, value
+
+def _open_map(fh) -> mmap.mmap | None:
+    if os.fstat(fh.fileno()).st_size == 0:
+        return None
+    return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+@contextlib.contextmanager
+def _mapped_save(path: str):
+    with open(path, "rb") as fh:
+        mm = _open_map(fh)
+        if mm is None:
+            raise json.JSONDecodeError("Empty save file", "", 0)
+        with mm:
+            yield mm
+
+def read_sections(path: str, *keys: str) -> dict:
+    with _mapped_save(path) as mm:
+        starts = find_top_level_keys(mm, keys)
+        return {key: _decode_value(mm, starts[key])[0] for key in keys if key in starts}
+
+def _line_indent(buf, pos: int) -> bytes:
+    line_start = buf.rfind(b"\n", 0, pos) + 1
+    end = line_start
+    while buf[end:end + 1] in (b" ", b"\t"):
+        end += 1
+    return buf[line_start:end]
+
+def _dump_section(value, indent: bytes, newline: bytes, multiline: bool) -> bytes:
+    if not multiline:
+        return json.dumps(value, separators=(",", ":")).encode("utf-8")
+    unit = indent.decode("ascii") or "    "
+    text = json.dumps(value, indent=unit).replace("\n", "\n" + unit)
+    return text.replace("\n", newline.decode("ascii")).encode("utf-8")
+
+def write_section(path: str, key: str, value) -> None:
+    with open(path, "r+b") as fh:
+        mm = _open_map(fh)
+        found = None
+        if mm is not None:
+            with mm:
+                found = find_section(mm, key)
+                if found is not None:
+                    start, end, _ = found
+                    key_pos = mm.rfind(json.dumps(key).encode("utf-8"), 0, start)
+                    indent = _line_indent(mm, key_pos)
+                    old = mm[start:end]
+                    newline = b"\r\n" if b"\r\n" in old else b"\n"
+                    multiline = b"\n" in old
+                    tail = mm[end:]
+
+        if found is None:
+            fh.seek(0)
+            save_data = json.loads(fh.read().decode("utf-8")) if mm is not None else {}
+            save_data[key] = value
+            fh.seek(0)
+            fh.write(json.dumps(save_data, indent=4).encode("utf-8"))
+            fh.truncate()
+            return
+
+        fh.seek(start)
+        fh.write(_dump_section(value, indent, newline, multiline))
+        fh.write(tail)
+        fh.truncate()
+
+def backup_path_for(path: str) -> str:
+    return path.replace(".json", "_backup.json")
+
+def read_inventory_sections(path: str) -> dict:
+    with _mapped_save(path) as mm:
+        starts = find_top_level_keys(mm, ("Inventory", "Loadout", "PersonalInventory"))
+        sections = {key: _decode_value(mm, starts[key])[0] for key in ("Inventory", "Loadout") if key in starts}
+        root_inv = sections.get("Inventory", {})
+        if "PersonalInventory" in starts and not (sections.get("Loadout") or root_inv.get("Loadout")):
+            sections["PersonalInventory"] = _decode_value(mm, starts["PersonalInventory"])[0]
+    return sections
+
+def inventory_view(sections: dict) -> tuple[dict, dict]:
+    root_inv = sections.get("Inventory", {})
+    inv_dict = root_inv.get("Inventory") or {k: v for k, v in root_inv.items() if k.isdigit()}
+    loadout_dict = (
+        sections.get("Loadout") or
+        root_inv.get("Loadout") or
+        sections.get("PersonalInventory", {}).get("Loadout", {}))
+    return inv_dict, loadout_dict
+
+class SaveSession:
+    def __init__(self, path: str):
+        self.path = path
+        self.fingerprint = None
+        self.inventory = None
+        self.views = None
+        self.lock = threading.RLock()
+
+    def stat(self) -> tuple[int, int]:
+        st = os.stat(self.path)
+        return st.st_mtime_ns, st.st_size
+
+    def is_stale(self) -> bool:
+        with self.lock:
+            return self.inventory is None or self.stat() != self.fingerprint
+
+    def load(self) -> SlotTable:
+        with self.lock:
+            if self.is_stale():
+                fingerprint = self.stat()
+                sections = read_inventory_sections(self.path)
+                root_inv = sections.get("Inventory", {})
+                inv_dict, loadout_dict = inventory_view(sections)
+                self.inventory = SlotTable.from_json(root_inv)
+                # Flat saves keep their slots in the Inventory section itself, so the
+                # section table doubles as the inventory view.
+                view = SlotTable.from_json(inv_dict) if root_inv.get("Inventory") else self.inventory
+                self.views = (view, SlotTable.from_json(loadout_dict))
+                self.fingerprint = fingerprint
+            return self.inventory
+
+    def tables(self) -> tuple[SlotTable, SlotTable]:
+        with self.lock:
+            self.load()
+            return self.views
+
+    def write_inventory(self, inventory: SlotTable) -> None:
+        with self.lock:
+            self.load()
+            write_section(self.path, "Inventory", inventory.to_json())
+            if self.views[0] is self.inventory:
+                self.views = (inventory, self.views[1])
+            self.inventory = inventory
+            self.fingerprint = self.stat()
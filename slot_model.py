@@ -0,0 +1,184 @@
+from collections import OrderedDict
+
+SLOT_COUNT = 80
+SECTIONS = {
+    "action": (0, 7),
+    "main": (8, 31),
+    "rune": (32, 55),
+    "quest": (56, 79)
+}
+
+class Slot:
+    __slots__ = ("guid", "item_id", "count", "durability", "vital_shield", "inventory_index", "extra", "order")
+
+    FIELDS = (
+        ("GUID", "guid"),
+        ("ItemData", "item_id"),
+        ("Count", "count"),
+        ("Durability", "durability"),
+        ("VitalShield", "vital_shield"),
+        ("PlayerInventoryItemIndex", "inventory_index")
+    )
+    ATTRS = dict(FIELDS)
+    POSITIONS = {key: i for i, (key, _) in enumerate(FIELDS)}
+
+    def __init__(self, item_id: str | None = None, guid: str | None = None, count: int | None = None,
+                 durability: int | None = None, vital_shield=None, inventory_index: int | None = None):
+        self.guid = guid
+        self.item_id = item_id
+        self.count = count
+        self.durability = durability
+        self.vital_shield = vital_shield
+        self.inventory_index = inventory_index
+        self.extra = None
+        self.order = None
+
+    @classmethod
+    def from_json(cls, entry: dict) -> "Slot":
+        slot = cls.__new__(cls)
+        for _, attr in cls.FIELDS:
+            setattr(slot, attr, None)
+        slot.extra = None
+        canonical = True
+        last = -1
+        for key, value in entry.items():
+            attr = cls.ATTRS.get(key)
+            # Explicit nulls stay in extra so "absent" and "null" round-trip differently.
+            if attr is None or value is None:
+                if slot.extra is None:
+                    slot.extra = {}
+                slot.extra[key] = value
+                canonical = False
+                continue
+            setattr(slot, attr, value)
+            position = cls.POSITIONS[key]
+            canonical = canonical and position > last
+            last = position
+        slot.order = None if canonical else tuple(entry)
+        return slot
+
+    def to_json(self) -> dict:
+        if self.order is None:
+            out = {}
+            for key, attr in self.FIELDS:
+                value = getattr(self, attr)
+                if value is not None:
+                    out[key] = value
+            return out
+        out = {}
+        for key in self.order:
+            attr = self.ATTRS.get(key)
+            value = getattr(self, attr) if attr else None
+            if value is not None:
+                out[key] = value
+            elif self.extra is not None and key in self.extra:
+                out[key] = self.extra[key]
+        for key, attr in self.FIELDS:
+            value = getattr(self, attr)
+            if value is not None and key not in out:
+                out[key] = value
+        return out
+
+    def __repr__(self):
+        return f"Slot({self.item_id!r}, count={self.count!r})"
+
+class SlotTable:
+    __slots__ = ("slots", "occupied", "max_slot_index", "extra")
+
+    def __init__(self, size: int = SLOT_COUNT):
+        self.slots = [None] * size
+        self.occupied = 0
+        self.max_slot_index = None
+        self.extra = OrderedDict()
+
+    @classmethod
+    def from_json(cls, section: dict, size: int = SLOT_COUNT) -> "SlotTable":
+        table = cls(size)
+        for key, value in section.items():
+            if key.isdigit():
+                table[int(key)] = Slot.from_json(value)
+            elif key == "MaxSlotIndex":
+                table.max_slot_index = value
+            else:
+                table.extra[key] = value
+        return table
+
+    def copy(self) -> "SlotTable":
+        table = SlotTable(0)
+        table.slots = list(self.slots)
+        table.occupied = self.occupied
+        table.max_slot_index = self.max_slot_index
+        table.extra = OrderedDict(self.extra)
+        return table
+
+    def to_json(self) -> OrderedDict:
+        out = OrderedDict((str(idx), slot.to_json()) for idx, slot in self)
+        if self.max_slot_index is not None:
+            out["MaxSlotIndex"] = self.max_slot_index
+        out.update(self.extra)
+        return out
+
+    def _grow(self, idx: int) -> None:
+        if idx >= len(self.slots):
+            self.slots.extend([None] * (idx + 1 - len(self.slots)))
+
+    def __getitem__(self, idx: int) -> Slot | None:
+        return self.slots[idx] if 0 <= idx < len(self.slots) else None
+
+    def __setitem__(self, idx: int, slot: Slot) -> None:
+        if idx < 0:
+            raise IndexError(f"Slot {idx} is out of range")
+        self._grow(idx)
+        self.slots[idx] = slot
+        self.occupied |= 1 << idx
+
+    def __delitem__(self, idx: int) -> None:
+        if self[idx] is not None:
+            self.slots[idx] = None
+            self.occupied &= ~(1 << idx)
+
+    def __contains__(self, idx: int) -> bool:
+        return idx >= 0 and bool(self.occupied >> idx & 1)
+
+    def __len__(self) -> int:
+        return self.occupied.bit_count()
+
+    def __iter__(self):
+        bits = self.occupied
+        while bits:
+            low = bits & -bits
+            idx = low.bit_length() - 1
+            yield idx, self.slots[idx]
+            bits ^= low
+
+    def highest(self) -> int:
+        return self.occupied.bit_length() - 1
+
+    @staticmethod
+    def _mask(start: int, end: int) -> int:
+        return ((1 << (end - start + 1)) - 1) << start
+
+    def range_is_free(self, start: int, end: int) -> bool:
+        return not self.occupied & self._mask(start, end)
+
+    def first_free(self, start: int = 0, end: int = SLOT_COUNT - 1) -> int | None:
+        free = ~self.occupied & self._mask(start, end)
+        return (free & -free).bit_length() - 1 if free else None
+
+    def free_ranges(self, start: int = 0, end: int = SLOT_COUNT - 1) -> list[tuple[int, int]]:
+        ranges = []
+        free = ~self.occupied & self._mask(start, end)
+        while free:
+            lo = (free & -free).bit_length() - 1
+            run = free >> lo
+            length = (~run & (run + 1)).bit_length() - 1
+            ranges.append((lo, lo + length - 1))
+            free &= ~self._mask(lo, lo + length - 1)
+        return ranges
+
+    def first_empty(self, section: str) -> int | None:
+        return self.first_free(*SECTIONS[section])
+
+    def item_at(self, idx: int) -> str | None:
+        slot = self[idx]
+        return slot.item_id if slot else None
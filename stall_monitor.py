@@ -0,0 +1,115 @@
+import json
+import sys
+import threading
+import time
+import traceback
+
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+MAX_STACK_SAMPLES = 5
+
+class StallMonitor:
+    def __init__(self, widget, threshold_ms: float = 200, interval_ms: int = 50, log=None):
+        self.widget = widget
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms
+        self.log = log or sys.stderr
+        self.main_ident = threading.get_ident()
+        self.histogram = [0] * (len(BUCKETS_MS) + 1)
+        self.ticks = 0
+        self.stalls = []
+        self._lock = threading.Lock()
+        self._pending_stacks = []
+        self._expected = None
+        self._last_tick = None
+        self._after_id = None
+        self._running = threading.Event()
+        self._sampler = None
+
+    def start(self) -> None:
+        if self._running.is_set():
+            return
+        self._running.set()
+        self._last_tick = time.perf_counter()
+        self._expected = self._last_tick + self.interval / 1000
+        self._after_id = self.widget.after(self.interval, self._tick)
+        self._sampler = threading.Thread(target=self._sample, name="stall-sampler", daemon=True)
+        self._sampler.start()
+
+    def stop(self) -> None:
+        self._running.clear()
+        if self._after_id:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def _bucket(self, lateness_ms: float) -> int:
+        for i, bound in enumerate(BUCKETS_MS):
+            if lateness_ms < bound:
+                return i
+        return len(BUCKETS_MS)
+
+    def _tick(self) -> None:
+        now = time.perf_counter()
+        lateness = max(0.0, now - self._expected)
+        self.histogram[self._bucket(lateness * 1000)] += 1
+        self.ticks += 1
+
+        with self._lock:
+            stacks, self._pending_stacks = self._pending_stacks, []
+            self._last_tick = now
+        if lateness >= self.threshold:
+            self._report_stall(now, lateness, stacks)
+
+        self._expected = now + self.interval / 1000
+        if self._running.is_set():
+            self._after_id = self.widget.after(self.interval, self._tick)
+
+    def _sample(self) -> None:
+        period = max(self.threshold / 4, 0.005)
+        while self._running.is_set():
+            time.sleep(period)
+            with self._lock:
+                blocked = time.perf_counter() - self._last_tick
+                if blocked < self.threshold + self.interval / 1000 or len(self._pending_stacks) >= MAX_STACK_SAMPLES:
+                    continue
+                frame = sys._current_frames().get(self.main_ident)
+                if frame is None:
+                    continue
+                stack = "".join(traceback.format_stack(frame))
+                if not self._pending_stacks or self._pending_stacks[-1][1] != stack:
+                    self._pending_stacks.append((round(blocked * 1000), stack))
+
+    def _report_stall(self, now: float, lateness: float, stacks: list) -> None:
+        record = {
+            "at": time.time(),
+            "duration_ms": round(lateness * 1000, 1),
+            "samples": [{"blocked_ms": ms, "stack": stack} for ms, stack in stacks]
+        }
+        self.stalls.append(record)
+        print(f"[stall] Tk main loop blocked for {record['duration_ms']:.0f} ms "
+              f"(threshold {self.threshold * 1000:.0f} ms)", file=self.log)
+        for sample in record["samples"]:
+            print(f"  after {sample['blocked_ms']} ms:\n{sample['stack']}", file=self.log)
+
+    def summary(self) -> dict:
+        labels = [f"<{b}ms" for b in BUCKETS_MS] + [f">={BUCKETS_MS[-1]}ms"]
+        return {
+            "interval_ms": self.interval,
+            "threshold_ms": self.threshold * 1000,
+            "ticks": self.ticks,
+            "histogram": dict(zip(labels, self.histogram)),
+            "stalls": self.stalls
+        }
+
+    def export(self, path: str) -> None:
+        summary = self.summary()
+        if path.lower().endswith(".csv"):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("bucket,count\n")
+                for label, count in summary["histogram"].items():
+                    f.write(f"{label},{count}\n")
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(summary, f, indent=4)
@@ -0,0 +1,398 @@
+import argparse
+import gc
+import importlib
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import catalog
+
+SCROLL_COOLDOWN = 0.06
+SETTLE_TIMEOUT = 30.0
+LONG_FRAME_MS = 50
+SEARCH_TERMS = ("a", "ar", "arr", "bronze", "ore", "zzz")
+
+class HeadlessDialogs:
+    def __init__(self):
+        self.counts = {}
+
+    def _record(self, kind):
+        def dialog(title, message=None, **kwargs):
+            self.counts[kind] = self.counts.get(kind, 0) + 1
+            if kind == "showerror":
+                print(f"[dialog] {title}: {message}", file=sys.stderr)
+            return True
+        return dialog
+
+    def __getattr__(self, name):
+        return self._record(name)
+
+def start_xvfb() -> subprocess.Popen:
+    display = 99
+    while os.path.exists(f"/tmp/.X{display}-lock"):
+        display += 1
+    proc = subprocess.Popen(["Xvfb", f":{display}", "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 10
+    while not os.path.exists(f"/tmp/.X11-unix/X{display}"):
+        if proc.poll() is not None or time.monotonic() > deadline:
+            proc.kill()
+            raise RuntimeError("Xvfb did not start")
+        time.sleep(0.05)
+    os.environ["DISPLAY"] = f":{display}"
+    return proc
+
+def _fake_pid(rng: random.Random) -> str:
+    alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+    return "".join(rng.choice(alphabet) for _ in range(22))
+
+def make_catalog(path: str, size: int, rng: random.Random) -> list[dict]:
+    templates = catalog.read_item_entries()
+    entries = []
+    for i in range(size):
+        entry = dict(templates[i % len(templates)])
+        if i >= len(templates):
+            entry["SourceString"] = f"{entry['SourceString']} {i // len(templates)}"
+            entry["PersistenceID"] = _fake_pid(rng)
+        entries.append(entry)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(entries, f, indent=2)
+    return entries
+
+def make_save(path: str, entries: list[dict], padding_mb: int, rng: random.Random) -> None:
+    inventory = {}
+    for slot in range(80):
+        entry = rng.choice(entries)
+        item = {"GUID": _fake_pid(rng), "ItemData": entry["PersistenceID"]}
+        if entry.get("MaxStackSize"):
+            item["Count"] = rng.randint(1, entry["MaxStackSize"])
+        if entry.get("BaseDurability"):
+            item["Durability"] = entry["BaseDurability"]
+        inventory[str(slot)] = item
+    inventory["MaxSlotIndex"] = 79
+    loadout = {str(i): {"PlayerInventoryItemIndex": i} for i in range(5)}
+    # Bulk ahead of the inventory keeps the section scanner honest on large saves.
+    world = [{"Id": _fake_pid(rng), "Position": [rng.random() * 1e5 for _ in range(3)], "Tags": ["[x]", "{y}"]}
+             for _ in range(padding_mb * 4000)]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"World": world, "Inventory": inventory, "Loadout": loadout}, f, indent=4)
+
+def settle(root) -> list[float]:
+    frames = []
+    deadline = time.perf_counter() + SETTLE_TIMEOUT
+    while True:
+        started = time.perf_counter()
+        root.update()
+        frames.append(time.perf_counter() - started)
+        if not root.tk.splitlist(root.tk.call("after", "info")):
+            return frames
+        if time.perf_counter() > deadline:
+            raise RuntimeError("UI did not settle")
+        time.sleep(0.001)
+
+def find_widgets(widget, cls) -> list:
+    found = [widget] if isinstance(widget, cls) else []
+    for child in widget.winfo_children():
+        found += find_widgets(child, cls)
+    return found
+
+class Recorder:
+    def __init__(self):
+        self.samples = {}
+
+    def measure(self, name: str, root, action) -> None:
+        started = time.perf_counter()
+        action()
+        frames = settle(root)
+        latency = time.perf_counter() - started
+        self.samples.setdefault(name, []).append((latency, frames))
+
+    def results(self) -> dict:
+        def pct(values, q):
+            values = sorted(values)
+            return values[min(len(values) - 1, int(q * len(values)))]
+
+        out = {}
+        for name, samples in self.samples.items():
+            latencies = [s[0] * 1000 for s in samples]
+            frames = [f * 1000 for s in samples for f in s[1]]
+            out[name] = {
+                "runs": len(samples),
+                "latency_ms": {"p50": round(pct(latencies, 0.5), 2), "p95": round(pct(latencies, 0.95), 2),
+                               "max": round(max(latencies), 2)},
+                "frame_ms": {"p95": round(pct(frames, 0.95), 2), "max": round(max(frames), 2)},
+                "long_frames": sum(1 for f in frames if f >= LONG_FRAME_MS)
+            }
+        return out
+
+def run_scenarios(editor, save_path: str, repeat: int, rec: Recorder) -> None:
+    root = editor.root
+    canvas = find_widgets(editor.editor_tab, editor.tk.Canvas)[0]
+    toggles = [b for b in find_widgets(canvas, editor.tk.Button) if b.cget("text").endswith("▼")]
+
+    def type_query(term):
+        editor.search_entry.delete(0, editor.tk.END)
+        for ch in term:
+            editor.search_entry.insert(editor.tk.END, ch)
+            editor.search_entry.event_generate("<KeyRelease>")
+
+    def clear_search():
+        editor.search_entry.delete(0, editor.tk.END)
+        editor.update_box_func("")
+
+    def scroll_to(fraction):
+        canvas.yview_moveto(fraction)
+        canvas.event_generate("<Motion>", x=10, y=10)
+
+    pristine = save_path + ".orig"
+    shutil.copyfile(save_path, pristine)
+    editor.entry_file.delete(0, editor.tk.END)
+    editor.entry_file.insert(0, save_path)
+    names = list(editor.item_lookup)
+
+    for _ in range(repeat):
+        for term in SEARCH_TERMS:
+            rec.measure("search", root, lambda t=term: type_query(t))
+        rec.measure("search_clear", root, clear_search)
+
+        for step in range(21):
+            time.sleep(SCROLL_COOLDOWN)
+            rec.measure("scroll", root, lambda f=step / 20: scroll_to(f))
+        canvas.yview_moveto(0)
+
+        for btn in toggles[:8]:
+            rec.measure("toggle_collapse", root, btn.invoke)
+            rec.measure("toggle_expand", root, btn.invoke)
+
+        editor.save_session = None
+        rec.measure("refresh_cold", root, lambda: editor.refresh_inventory_icons(save_path, editor.inventory_tab))
+        rec.measure("refresh_warm", root, lambda: editor.refresh_inventory_icons(save_path, editor.inventory_tab))
+
+        editor.injection_queue.clear()
+        for slot in range(8, 32, 4):
+            name = random.choice(names)
+            editor.injection_queue.append(editor.make_queue_entry(name, editor.item_lookup[name], 1, slot, slot + 3, None))
+        editor.update_queue_display()
+        rec.measure("inject_refresh", root, editor.inject_items)
+
+        shutil.copyfile(pristine, save_path)
+        backup = editor.save_io.backup_path_for(save_path)
+        if os.path.exists(backup):
+            os.remove(backup)
+
+def ui_counts(root) -> dict:
+    return {
+        "widgets": len(find_widgets(root, object)),
+        "tcl_commands": len(root.tk.splitlist(root.tk.call("info", "commands"))),
+        "images": len(root.tk.splitlist(root.tk.call("image", "names")))
+    }
+
+def soak(editor, save_path: str, cycles: int, warmup: int, sample_every: int) -> dict:
+    root = editor.root
+    pristine = save_path + ".orig"
+    shutil.copyfile(save_path, pristine)
+    names = list(editor.item_lookup)
+    slot_labels = editor.inventory_tab._inventory_widgets["slot_labels"]
+
+    def cycle(n):
+        editor.entry_file.delete(0, editor.tk.END)
+        editor.entry_file.insert(0, save_path)
+        editor.reset_inventory_tab(editor.inventory_tab)
+        editor.save_session = None
+        editor.refresh_inventory_icons(save_path, editor.inventory_tab)
+        settle(root)
+
+        for slot in (8, 20):
+            name = names[(n + slot) % len(names)]
+            editor.injection_queue.append(editor.make_queue_entry(name, editor.item_lookup[name], 1, slot, slot + 3, None))
+        editor.update_queue_display()
+        editor.inject_items()
+        settle(root)
+
+        editor.refresh_inventory_icons(save_path, editor.inventory_tab)
+        label = slot_labels[8]
+        label.event_generate("<Enter>")
+        label.event_generate("<Leave>")
+        settle(root)
+
+        term = SEARCH_TERMS[n % len(SEARCH_TERMS)]
+        editor.search_entry.delete(0, editor.tk.END)
+        editor.search_entry.insert(0, term)
+        editor.search_entry.event_generate("<KeyRelease>")
+        settle(root)
+
+        editor.search_entry.delete(0, editor.tk.END)
+        editor.update_box_func("")
+        editor.clear_queue()
+        settle(root)
+
+        shutil.copyfile(pristine, save_path)
+        backup = editor.save_io.backup_path_for(save_path)
+        if os.path.exists(backup):
+            os.remove(backup)
+
+    for n in range(warmup):
+        cycle(n)
+
+    gc.collect()
+    tracemalloc.start(10)
+    baseline = tracemalloc.take_snapshot()
+    baseline_counts = ui_counts(root)
+    samples = []
+    started = time.perf_counter()
+    for n in range(warmup, warmup + cycles):
+        cycle(n)
+        done = n - warmup + 1
+        if done % sample_every == 0 or done == cycles:
+            gc.collect()
+            samples.append({"cycle": done, "traced_bytes": tracemalloc.get_traced_memory()[0], **ui_counts(root)})
+            print(f"[soak] cycle {done}/{cycles}: {samples[-1]['traced_bytes'] / 1e6:.2f} MB traced, "
+                  f"{samples[-1]['widgets']} widgets, {samples[-1]['tcl_commands']} Tcl commands", file=sys.stderr)
+    final = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    growth = {"traced_bytes": 0}
+    if samples:
+        growth["traced_bytes"] = samples[-1]["traced_bytes"]
+        growth.update({key: samples[-1][key] - baseline_counts[key] for key in baseline_counts})
+    top = final.compare_to(baseline, "lineno")[:10]
+    return {
+        "cycles": cycles,
+        "warmup": warmup,
+        "seconds": round(time.perf_counter() - started, 1),
+        "baseline": baseline_counts,
+        "samples": samples,
+        "growth": growth,
+        "top_allocations": [str(stat) for stat in top if stat.size_diff > 0]
+    }
+
+def soak_failures(result: dict, limits: dict) -> list[str]:
+    failures = []
+    for key, limit in limits.items():
+        grown = result["growth"].get(key, 0)
+        if grown > limit:
+            failures.append(f"{key} grew by {grown} (limit {limit})")
+    return failures
+
+def _git_revision() -> dict:
+    here = os.path.dirname(os.path.abspath(__file__))
+    try:
+        rev = subprocess.run(["git", "rev-parse", "HEAD"], cwd=here, capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=here,
+                                    capture_output=True, text=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+    return {"commit": rev, "dirty": dirty}
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for name, result in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if not before:
+            continue
+        old, new = before["latency_ms"]["p50"], result["latency_ms"]["p50"]
+        ratio = new / old if old else 1.0
+        flag = " REGRESSION" if ratio > 1 + tolerance else ""
+        print(f"{name:16} p50 {old:9.2f} -> {new:9.2f} ms ({ratio:5.2f}x){flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drive the editor UI headlessly to time interactions or soak-test memory.")
+    parser.add_argument("--items", type=int, default=5000, help="synthetic catalog size")
+    parser.add_argument("--save-mb", type=int, default=20, help="approximate synthetic save size in MB")
+    parser.add_argument("--repeat", type=int, default=3, help="rounds of every scenario")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--compare", help="previous results JSON to compare p50 latencies against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p50 slowdown before failing (0.2 = 20%%)")
+    parser.add_argument("--no-xvfb", action="store_true", help="use the current DISPLAY instead of starting Xvfb")
+    parser.add_argument("--soak", type=int, metavar="CYCLES",
+                        help="run CYCLES load/inject/refresh/search/clear cycles and check for memory growth instead of timing")
+    parser.add_argument("--warmup", type=int, default=20, help="soak cycles to run before taking the baseline")
+    parser.add_argument("--sample-every", type=int, default=100, help="soak cycles between samples")
+    parser.add_argument("--max-growth-mb", type=float, default=8.0, help="allowed growth of traced Python memory")
+    parser.add_argument("--max-widget-growth", type=int, default=50, help="allowed growth in Tk widget count")
+    parser.add_argument("--max-command-growth", type=int, default=200, help="allowed growth in registered Tcl commands")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    random.seed(args.seed)
+    workdir = tempfile.mkdtemp(prefix="rsd_bench_")
+    xvfb = None
+    try:
+        data_dir = os.path.join(workdir, "data")
+        os.makedirs(data_dir)
+        entries = make_catalog(os.path.join(data_dir, "ItemID.txt"), args.items, rng)
+        save_path = os.path.join(workdir, "Bench.json")
+        make_save(save_path, entries, args.save_mb, rng)
+
+        if not args.no_xvfb:
+            xvfb = start_xvfb()
+        os.environ["RSD_DATA_DIR"] = data_dir
+
+        rec = Recorder()
+        started = time.perf_counter()
+        editor = importlib.import_module("save_editor")
+        editor.root.after_cancel(editor.catalog_watch_job)
+        editor.messagebox = HeadlessDialogs()
+        editor.root.geometry("800x600")
+        startup_frames = settle(editor.root)
+        rec.samples["startup"] = [(time.perf_counter() - started, startup_frames)]
+
+        report = {
+            **_git_revision(),
+            "python": platform.python_version(),
+            "tk": editor.tk.TkVersion,
+            "platform": platform.platform(),
+            "items": args.items,
+            "save_bytes": os.path.getsize(save_path)
+        }
+        failures = []
+        if args.soak:
+            report["soak"] = soak(editor, save_path, args.soak, args.warmup, args.sample_every)
+            failures = soak_failures(report["soak"], {
+                "traced_bytes": int(args.max_growth_mb * 1e6),
+                "widgets": args.max_widget_growth,
+                "tcl_commands": args.max_command_growth
+            })
+            report["soak"]["failures"] = failures
+        else:
+            run_scenarios(editor, save_path, args.repeat, rec)
+            report["repeat"] = args.repeat
+            report["results"] = rec.results()
+        editor.root.destroy()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+        if xvfb:
+            xvfb.terminate()
+            xvfb.wait()
+
+    text = json.dumps(report, indent=4)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if failures:
+        for failure in failures:
+            print(f"[soak] FAILED: {failure}", file=sys.stderr)
+        return 1
+    if args.compare and not args.soak:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.tolerance):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())